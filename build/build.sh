@@ -3,7 +3,13 @@
 #   Requires Zig (https://ziglang.org/) to be in $PATH.
 
 zig cc ../src/qprop.c -o ./qprop-portable/qprop-lib-windows-x64.dll -shared -target x86_64-windows-gnu -lm -fPIC -O2 -Wall -Wextra
-zig cc ../src/qprop.c -o ./qprop-portable/qprop-lib-linux-x64.so -shared -target x86_64-linux-gnu -lm -fPIC -O2 -Wall -Wextra
+#set QPROP_OPENMP=1 to build the Linux library with GCC and OpenMP instead, so that qprop_sweep()
+#computes the operating points in parallel (the library then depends on libgomp)
+if [ "$QPROP_OPENMP" = "1" ]; then
+    gcc ../src/qprop.c -o ./qprop-portable/qprop-lib-linux-x64.so -shared -lm -fPIC -O2 -Wall -Wextra -fopenmp
+else
+    zig cc ../src/qprop.c -o ./qprop-portable/qprop-lib-linux-x64.so -shared -target x86_64-linux-gnu -lm -fPIC -O2 -Wall -Wextra
+fi
 zig cc ../src/qprop.c -o ./qprop-portable/qprop-lib-macos-arm64.dylib -shared -target aarch64-macos -lm -fPIC -O2 -Wall -Wextra
 
 rm ./qprop-portable/qprop.lib
@@ -59,7 +59,7 @@ def main():
     #    ⬑hub                                                      ⬑tip
 
     #the sweep angle values should be in radians and should correspond to the radius values
-    β = [qprop.deg2rad(deg) for deg in [27.5, 22.0, 15.2, 10.2, 6.5, 4.6, 4.2]]
+    β = qprop.deg2rad([27.5, 22.0, 15.2, 10.2, 6.5, 4.6, 4.2])
     
     #extract the number of sections, to make subsequent calculations more convenient
     nsections = len(r)
@@ -70,16 +70,9 @@ def main():
     #specify the number of blades
     B = 2
 
-    #finally, define the rotor elements and create the rotor object with the specified properties
-    sections = []
-    for i in range(nsections):
-        newsection = qprop.create_section(
-            c[i],           #Element.c (m)
-            β[i],           #Element.beta (rad)
-            r[i],           #Element.r (m)
-            myairfoil       #Element.airfoil
-        )
-        sections.append(newsection)
+    #finally, define the rotor sections and create the rotor object with the specified properties
+    #all the sections share the same airfoil, so they can be created with a single call
+    sections = qprop.create_sections(c, β, r, myairfoil)
     myrotor = qprop.create_rotor(D, B, nsections, sections)
 
 
@@ -96,10 +89,8 @@ def main():
 
     #run qprop.c
     results = qprop.qprop(myrotor, Uinf, Ω)
-    for i in range(nsections):
-        if abs(results.residuals[i]) > 1e-6:
-            print("ERROR while running qprop: convergence not reached in one or more elements")
-            break
+    if qprop.check_residuals(results, 1e-6):
+        print("ERROR while running qprop: convergence not reached in one or more elements")
 
     #print the results of the analysis
     print("qprop.c results:")
@@ -110,5 +101,20 @@ def main():
     #   Thrust: 3.26103 N
     #   Torque: 0.03005 N-m
 
+
+    #OPTIONAL: parametric study
+    #when running many analyses on the same rotor, allocate the output once and let qprop overwrite it
+    #the buffer is freed automatically at the end of the "with" block
+    #(qprop.qprop_sweep does the same internally for a whole list of operating points)
+    with qprop.alloc_rotor_performance(results.nelems) as perf:
+        for rpm in [10000, 12000, 14020]:
+            qprop.qprop(myrotor, Uinf, rpm * math.pi/30, out=perf)
+            print("  ", rpm, "rpm: T =", round(perf.T, 5), "N, Q =", round(perf.Q, 5), "N-m")
+
+    #finally, free the memory allocated by the C library
+    #(the rotor was built in Python with create_rotor, so it is garbage collected)
+    qprop.free_rotor_performance(results)
+    qprop.free_airfoil(myairfoil)
+
 if __name__ == "__main__":
     main()
@@ -12,7 +12,7 @@ module QProp
 export Polar, Airfoil, Section, Rotor, RotorPerformance,
        deg2rad, read_xfoil_polar_from_file, import_xfoil_polars,
        analytic_polar_curves, import_rotor_geometry_apc,
-       import_rotor_geometry_uiuc, refine_rotor_sections, qprop;
+       import_rotor_geometry_uiuc, refine_rotor_sections, qprop, qprop_sweep;
 
 #import precompiled shared library for the current operating system
 lib_filename = "";
@@ -147,11 +147,12 @@ end
 """
 DEG2RAD converts degrees to radians
 Input:
-    - deg (double): angle in degrees
+    - deg (double or Vector{Float64}): angle(s) in degrees
 Output:
-    - (double): angle in radians
+    - (double or Vector{Float64}): angle(s) in radians
 Example:
     myangle = deg2rad(+45.0);
+    myangles = deg2rad([27.5, 22.0, 15.2]);
 """
 function deg2rad(rad)
     return ccall(
@@ -161,6 +162,16 @@ function deg2rad(rad)
         rad                                             #parameters
     );
 end
+function deg2rad(deg::Vector{Float64})
+    rad = zeros(length(deg));
+    ccall(
+        (:deg2rad_array, lib_filename),                 #C function
+        Cvoid,                                          #return type
+        (Ptr{Cdouble}, Ptr{Cdouble}, Cint),             #parameters types
+        deg, rad, length(deg)                           #parameters
+    );
+    return rad;
+end
 
 
 """
@@ -628,4 +639,66 @@ function qprop(rotor::Rotor, Uinf::Float64, Omega::Float64, tol::Float64=1e-6, i
     return perf;
 end
 
+
+"""
+QPROP_SWEEP runs qprop at multiple operating points of the same rotor
+Input:
+    - rotor (Rotor): struct containing the rotor data
+    - Uinf: vector of freestream velocities in m/s
+    - Omega: vector of rotor speeds in rad/s (same length as Uinf)
+    - tol: stopping criterion tolerance (default value: 1e-6)
+    - itmax: maximum number of iterations (default value: 100)
+    - rho: air density in kg/m3 (default value: 1.225)
+    - mu: air dynamic viscosity in Pa-s (default value: 1.81e-5)
+    - a: speed of sound in m/s (default value: 0.0) - set to 0 to disable Mach correction)
+Output:
+    - (Vector{Float64}): thrust in N at each operating point
+    - (Vector{Float64}): torque in N-m at each operating point
+    - (Vector{Float64}): thrust coefficient at each operating point
+    - (Vector{Float64}): power coefficient at each operating point
+    - (Vector{Float64}): advance ratio at each operating point
+Notes:
+    - the whole sweep runs in a single C call
+    - the prebuilt binaries are single-threaded: to compute the points in parallel,
+      build the Linux library with OpenMP (QPROP_OPENMP=1 build/build.sh)
+    - all outputs are NaN at the points that did not converge
+"""
+function qprop_sweep(rotor::Rotor, Uinf::Vector{Float64}, Omega::Vector{Float64}, tol::Float64=1e-6, itmax::Int=100, rho::Float64=1.225, mu::Float64=1.81e-5, a::Float64=0.0)
+    if length(Uinf) != length(Omega)
+        error("ERROR in qprop_sweep(): Uinf and Omega must have the same length");
+    end
+
+    #convert rotor in C format
+    csections = Vector{CSection}(undef, rotor.nsections);
+    for i=1:rotor.nsections
+        csections[i] = CSection(
+            rotor.sections[i].c,
+            rotor.sections[i].beta,
+            rotor.sections[i].r,
+            airfoil2cairfoil(rotor.sections[i].airfoil)
+        );
+    end
+    crotor = CRotor(rotor.D, rotor.B, rotor.nsections, pointer(csections));
+
+    #run the sweep
+    npoints = length(Uinf);
+    T = Vector{Float64}(undef, npoints);
+    Q = Vector{Float64}(undef, npoints);
+    CT = Vector{Float64}(undef, npoints);
+    CP = Vector{Float64}(undef, npoints);
+    J = Vector{Float64}(undef, npoints);
+    nfailed = ccall(
+        (:qprop_sweep, lib_filename),                                               #C function
+        Cint,                                                                       #return type
+        (Ptr{CRotor}, Ptr{Float64}, Ptr{Float64}, Cint,
+         Float64, Cint, Float64, Float64, Float64,
+         Ptr{Float64}, Ptr{Float64}, Ptr{Float64}, Ptr{Float64}, Ptr{Float64}),     #parameters types
+        Ref(crotor), Uinf, Omega, npoints, tol, itmax, rho, mu, a, T, Q, CT, CP, J  #parameters
+    );
+    if nfailed < 0
+        error("ERROR in qprop_sweep(): memory allocation error");
+    end
+    return T, Q, CT, CP, J;
+end
+
 end #module
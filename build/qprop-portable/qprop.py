@@ -9,9 +9,17 @@
 #   Author: Andrea Pavan
 #   License: MIT
 #-------------------------------------------------------------------------------
+import array
+import collections
+import concurrent.futures
 import ctypes
+import math
 import os
 import platform
+try:
+    import numpy as np
+except ImportError:
+    np = None       #NumPy is optional: it is only needed for the array views of RotorPerformance
 
 #import precompiled shared library for the current operating system
 lib_filename = ""
@@ -32,7 +40,39 @@ else:
     raise ValueError("ERROR in qprop.py: the provided binaries do not support the current operating system")
 if not os.path.exists(lib_filename):
     raise ValueError("ERROR in qprop.py: unable to find shared library")
-lib = ctypes.CDLL(lib_filename)
+
+#placeholder for a C function that is missing from the shared library
+#INTERNAL USE ONLY
+class _MissingFunction:
+    def __init__(self, name):
+        self.__name__ = name
+        self.argtypes = None
+        self.restype = None
+
+    def __call__(self, *args):
+        raise RuntimeError("ERROR in qprop.py: " + self.__name__ + "() is not available in " + os.path.basename(lib_filename)
+                           + ", rebuild the library from qprop.c (see build/build.sh)")
+
+#shared library whose missing functions are bound lazily, so that older prebuilt
+#binaries can still be imported: only the functions they lack raise an error when called
+#INTERNAL USE ONLY
+class _Library(ctypes.CDLL):
+    def __getattr__(self, name):
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            if name.startswith("__") and name.endswith("__"):
+                raise
+            missing = _MissingFunction(name)
+            setattr(self, name, missing)
+            return missing
+
+lib = _Library(lib_filename)
+
+#check if the shared library exports a C function
+#INTERNAL USE ONLY
+def _has_function(name):
+    return not isinstance(getattr(lib, name), _MissingFunction)
 
 
 
@@ -95,6 +135,85 @@ class RotorPerformance(ctypes.Structure):
         ("nelems", ctypes.c_int)
     ]
 
+    def as_numpy(self, name):
+        """
+        AS_NUMPY returns a zero-copy NumPy view of a per-element output array
+        Input:
+            - name: name of the array ("residuals", "Gamma", "lambdaw", "r", "W", "phi", "dTdr" or "dQdr")
+        Output:
+            - (numpy.ndarray): view of the C array with nelems values
+        Notes:
+            - the view shares memory with the C library: it becomes invalid
+              after calling free_rotor_performance(RotorPerformance)
+            - the same views are also available as attributes, e.g. results.dTdr_np
+            - views are cached on the object, so repeated accesses are cheap
+        Example:
+            results = qprop(myrotor, Uinf, Omega)
+            max_residual = abs(results.as_numpy("residuals")).max()
+        """
+        if np is None:
+            raise ImportError("ERROR in qprop.py: numpy is required to create array views")
+        #views are cached: qprop writes in place, so the C arrays never move while the output is alive
+        views = self.__dict__.setdefault("_np_views", {})
+        if name not in views:
+            views[name] = np.ctypeslib.as_array(getattr(self, name), shape=(self.nelems,))
+        return views[name]
+
+    def as_arrays(self):
+        """
+        AS_ARRAYS returns zero-copy NumPy views of all the per-element output arrays
+        Input:
+            - none
+        Output:
+            - (dict): one numpy.ndarray with nelems values for each of "residuals",
+              "Gamma", "lambdaw", "r", "W", "phi", "dTdr" and "dQdr"
+        Notes:
+            - same views returned by as_numpy(name), so they share memory with the C library
+        Example:
+            results = qprop(myrotor, Uinf, Omega)
+            elems = results.as_arrays()
+            plt.plot(elems["r"]/(D/2), elems["dTdr"])
+        """
+        return {name: self.as_numpy(name) for name in _ELEMENT_ARRAYS}
+
+    def as_structured(self):
+        """
+        AS_STRUCTURED returns a zero-copy structured NumPy view of the overall outputs
+        Input:
+            - none
+        Output:
+            - (numpy.ndarray): one record with fields T, Q, CT, CP, J and nelems
+        Notes:
+            - the record shares memory with the C library, like the array views
+        Example:
+            results = qprop(myrotor, Uinf, Omega)
+            summary = results.as_structured()
+            print(summary["T"][0], summary["Q"][0])
+        """
+        if np is None:
+            raise ImportError("ERROR in qprop.py: numpy is required to create array views")
+        names = ["T", "Q", "CT", "CP", "J", "nelems"]
+        dtype = np.dtype({
+            "names": names,
+            "formats": ["f8", "f8", "f8", "f8", "f8", np.intc],
+            "offsets": [getattr(RotorPerformance, name).offset for name in names],
+            "itemsize": ctypes.sizeof(RotorPerformance)
+        })
+        return np.frombuffer((ctypes.c_char * ctypes.sizeof(self)).from_address(ctypes.addressof(self)), dtype=dtype, count=1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        free_rotor_performance(self)
+        return False
+
+#add a read-only NumPy view for each per-element array, e.g. RotorPerformance.dTdr_np
+_ELEMENT_ARRAYS = ("residuals", "Gamma", "lambdaw", "r", "W", "phi", "dTdr", "dQdr")
+for _name in _ELEMENT_ARRAYS:
+    setattr(RotorPerformance, _name + "_np", property(lambda self, name=_name: self.as_numpy(name)))
+del _name
+
 
 
 #----------------------------
@@ -102,6 +221,18 @@ class RotorPerformance(ctypes.Structure):
 #----------------------------
 
 
+#wrap a sequence in a C array of n elements
+#NumPy arrays with matching dtype and layout are shared without copying, anything else is copied once
+#INTERNAL USE ONLY
+def _as_c_array(values, n, ctype=ctypes.c_double, typecode="d"):
+    if np is not None and isinstance(values, np.ndarray):
+        values = np.ascontiguousarray(values, dtype=np.dtype(ctype))
+        if values.flags.writeable:
+            return (ctype * n).from_buffer(values)
+        return (ctype * n).from_buffer_copy(values)
+    return (ctype * n).from_buffer(array.array(typecode, values))
+
+
 def create_polar(Re, alpha, CL, CD, size):
     """
     CREATE_POLAR creates a Polar object from Python lists
@@ -113,12 +244,17 @@ def create_polar(Re, alpha, CL, CD, size):
         - size: number of points in the polar
     Output:
         - (Polar): data structure containing the polar data
+    Notes:
+        - contiguous float64 NumPy arrays are used without copying: modifying them
+          afterwards also modifies the polar
     """
     newpolar = Polar()
     newpolar.Re = Re
-    newpolar.alpha = (ctypes.c_double * size)(*alpha)
-    newpolar.CL = (ctypes.c_double * size)(*CL)
-    newpolar.CD = (ctypes.c_double * size)(*CD)
+    #copy each list into a contiguous buffer with a single memcpy, or share float64 NumPy arrays
+    #NOTE: ctypes keeps a reference to the buffers, so they are not garbage collected
+    newpolar.alpha = _as_c_array(alpha, size)
+    newpolar.CL = _as_c_array(CL, size)
+    newpolar.CD = _as_c_array(CD, size)
     newpolar.size = size
     return newpolar
 
@@ -131,9 +267,15 @@ def create_airfoil(polars, size):
         - size: number of polars in the airfoil
     Output:
         - (Airfoil): data structure containing the specified airfoil polars
+    Notes:
+        - polars are sorted from lowest to highest Re, so that qprop never needs
+          to reorder them (which is not safe when the airfoil is shared by threads)
     """
     newairfoil = Airfoil()
-    newairfoil.polars = (Polar * size)(*polars)
+    polars_array = (ctypes.POINTER(Polar) * size)()
+    for i, polar in enumerate(sorted(polars[:size], key=lambda polar: polar.Re)):
+        polars_array[i] = ctypes.pointer(polar)
+    newairfoil.polars = polars_array
     newairfoil.size = size
     return newairfoil
 
@@ -157,6 +299,39 @@ def create_section(c, beta, r, airfoil):
     return newsection
 
 
+lib.create_sections.argtypes = [ctypes.POINTER(Section), ctypes.c_int,
+                                ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double),
+                                ctypes.POINTER(Airfoil)]
+lib.create_sections.restype = None
+def create_sections(c, beta, r, airfoil):
+    """
+    CREATE_SECTIONS creates an array of Section objects that share the same airfoil
+    Input:
+        - c: array of chord lengths (m)
+        - beta: array of twist angles (rad) - same size as c
+        - r: array of radial distances (m) - same size as c
+        - airfoil (Airfoil): airfoil data of all the sections
+    Output:
+        - (array of Section): data structures containing the sections data
+    Notes:
+        - all sections are filled with a single call to the C library
+    Example:
+        sections = create_sections(c, beta, r, myairfoil)
+        myrotor = create_rotor(D, B, len(sections), sections)
+    """
+    nsections = len(r)
+    sections = (Section * nsections)()
+    lib.create_sections(
+        sections, nsections,
+        _as_c_array(c, nsections),
+        _as_c_array(beta, nsections),
+        _as_c_array(r, nsections),
+        ctypes.byref(airfoil)
+    )
+    sections._airfoil = airfoil         #keep the airfoil polars alive as long as the sections
+    return sections
+
+
 def create_rotor(D, B, nsections, sections):
     """
     CREATE_ROTOR creates a Rotor object from Python lists
@@ -172,23 +347,36 @@ def create_rotor(D, B, nsections, sections):
     newrotor.D = D
     newrotor.B = B
     newrotor.nsections = nsections
-    newrotor.sections = (Section * nsections)(*sections)
+    if isinstance(sections, Section * nsections):
+        #arrays returned by create_sections() are used in place
+        newrotor.sections = sections
+        return newrotor
+    #copy all the sections into a contiguous array with a single memcpy
+    sections_array = (Section * nsections).from_buffer_copy(b"".join([bytes(sections[i]) for i in range(nsections)]))
+    sections_array._sections = sections     #keep the airfoil polars alive as long as the rotor
+    newrotor.sections = sections_array
     return newrotor
 
 
-lib.deg2rad.argtypes = [ctypes.c_double]
-lib.deg2rad.restype = ctypes.c_double
 def deg2rad(deg):
     """
     DEG2RAD converts degrees to radians
     Input:
-        - deg (double): angle in degrees
+        - deg (double or list of double): angle(s) in degrees
     Output:
-        - (double): angle in radians
+        - (double or list of double): angle(s) in radians - NumPy arrays are returned as NumPy arrays
+    Notes:
+        - computed in Python with the same operations as the C function, since a
+          single multiplication is cheaper than a call to the C library
     Example:
         myangle = deg2rad(+45.0)
+        myangles = deg2rad([27.5, 22.0, 15.2])
     """
-    return lib.deg2rad(deg)
+    if not hasattr(deg, "__len__"):
+        return deg*math.pi/180.0
+    if np is not None and isinstance(deg, np.ndarray):
+        return deg*math.pi/180.0
+    return [d*math.pi/180.0 for d in deg]
 
 
 lib.read_xfoil_polar_from_file.argtypes = [ctypes.c_char_p]
@@ -214,7 +402,10 @@ def read_xfoil_polar_from_file(filename):
     Example:
         mypolar = read_xfoil_polar_from_file("naca4412_Re0.030_M0.00_N6.0.txt")
     """
-    return lib.read_xfoil_polar_from_file(filename.encode()).contents
+    newpolar = lib.read_xfoil_polar_from_file(filename.encode())
+    if not newpolar:
+        raise RuntimeError("ERROR in read_xfoil_polar_from_file(): failed to read polar from file")
+    return newpolar.contents
 
 
 lib.free_polar.argtypes = [ctypes.POINTER(Polar)]
@@ -239,12 +430,28 @@ def free_airfoil(currentairfoil):
         - currentairfoil (Airfoil): object that is no longer needed
     Output:
         - none
-    """
+    Notes:
+        - airfoils returned by analytic_polar_curves can be shared by multiple callers:
+          the memory is released only when free_airfoil has been called once for each
+          call to analytic_polar_curves that returned it
+    """
+    address = ctypes.addressof(currentairfoil)
+    if address in _analytic_polar_refs:
+        _analytic_polar_refs[address] -= 1
+        if _analytic_polar_refs[address] > 0:
+            #still in use by another caller of analytic_polar_curves
+            return
+        del _analytic_polar_refs[address]
+        for key, cachedairfoil in list(_analytic_polar_cache.items()):
+            if ctypes.addressof(cachedairfoil) == address:
+                del _analytic_polar_cache[key]
     lib.free_airfoil(ctypes.byref(currentairfoil))
 
 
 lib.import_xfoil_polars.argtypes = [ctypes.POINTER(ctypes.c_char_p), ctypes.c_int]
 lib.import_xfoil_polars.restype = ctypes.POINTER(Airfoil)
+lib.create_airfoil_from_polars.argtypes = [ctypes.POINTER(ctypes.POINTER(Polar)), ctypes.c_int]
+lib.create_airfoil_from_polars.restype = ctypes.POINTER(Airfoil)
 def import_xfoil_polars(filenames):
     """
     IMPORT_XFOIL_POLARS imports airfoil polars from multiple text files
@@ -261,18 +468,87 @@ def import_xfoil_polars(filenames):
           and for each Polar using malloc and realloc.
           It is the caller's responsibility to free this memory when it is no longer
           needed, by calling unload_airfoil_from_memory(Airfoil)
+        - On multi-core machines, more than 4 files are parsed in parallel threads,
+          since the C library releases the GIL while reading each file
+          (unless the prebuilt library predates create_airfoil_from_polars)
     Example:
         filenames = ["naca4412_Re0.030_M0.00_N6.0.txt", "naca4412_Re0.060_M0.00_N6.0.txt"]
         myairfoil = import_xfoil_polars(filenames)
     """
-    filenames_array = (ctypes.c_char_p * len(filenames)) (*[filename.encode() for filename in filenames])
-    return lib.import_xfoil_polars(filenames_array, len(filenames)).contents
+    nfiles = len(filenames)
+    nthreads = min(nfiles, os.cpu_count() or 1)
+    if nfiles > 4 and nthreads > 1 and _has_function("create_airfoil_from_polars"):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+            polars = list(executor.map(lib.read_xfoil_polar_from_file, [filename.encode() for filename in filenames]))
+        if not all(polars):
+            for polar in polars:
+                if polar:
+                    lib.free_polar(polar)
+            raise RuntimeError("ERROR in import_xfoil_polars(): failed to read airfoil polars")
+        polars_array = (ctypes.POINTER(Polar) * nfiles)()
+        for i, polar in enumerate(polars):
+            polars_array[i] = polar
+        newairfoil = lib.create_airfoil_from_polars(polars_array, nfiles)
+        if not newairfoil:
+            for polar in polars:
+                lib.free_polar(polar)
+            raise RuntimeError("ERROR in import_xfoil_polars(): failed to read airfoil polars")
+        return newairfoil.contents
+    filenames_array = (ctypes.c_char_p * nfiles)()
+    for i, filename in enumerate(filenames):
+        filenames_array[i] = filename.encode()
+    newairfoil = lib.import_xfoil_polars(filenames_array, nfiles)
+    if not newairfoil:
+        raise RuntimeError("ERROR in import_xfoil_polars(): failed to read airfoil polars")
+    return newairfoil.contents
+
+
+lib.create_airfoil_from_arrays.argtypes = [ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double),
+                                          ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double),
+                                          ctypes.POINTER(ctypes.c_int), ctypes.c_int]
+lib.create_airfoil_from_arrays.restype = ctypes.POINTER(Airfoil)
+def create_airfoil_from_arrays(Re, alpha, CL, CD, sizes):
+    """
+    CREATE_AIRFOIL_FROM_ARRAYS builds an airfoil from polars stored back to back in flat arrays
+    Input:
+        - Re: Reynolds number of each polar
+        - alpha: angle of attacks of all polars, one after the other (rad)
+        - CL: lift coefficients - same size as alpha
+        - CD: drag coefficients - same size as alpha
+        - sizes: number of points in each polar - same size as Re
+    Output:
+        - (Airfoil): data structure containing the airfoil polars, sorted from lowest to highest Re
+    Notes:
+        - The arrays are copied by the C library, so they can be modified afterwards
+        - It is the caller's responsibility to free this memory when it is no longer
+          needed, by calling free_airfoil(Airfoil)
+    Example:
+        myairfoil = create_airfoil_from_arrays([50000, 100000], [-0.1, 0.1, -0.1, 0.1], [0.0, 1.0, 0.0, 1.1], [0.02, 0.03, 0.01, 0.02], [2, 2])
+    """
+    npolars = len(Re)
+    npoints = sum(int(size) for size in sizes)
+    if len(sizes) != npolars or len(alpha) != npoints or len(CL) != npoints or len(CD) != npoints:
+        raise ValueError("ERROR in create_airfoil_from_arrays(): inconsistent array sizes")
+    newairfoil = lib.create_airfoil_from_arrays(
+        _as_c_array(Re, npolars),
+        _as_c_array(alpha, npoints),
+        _as_c_array(CL, npoints),
+        _as_c_array(CD, npoints),
+        _as_c_array([int(size) for size in sizes], npolars, ctypes.c_int, "i"),
+        npolars
+    )
+    if not newairfoil:
+        raise RuntimeError("ERROR in create_airfoil_from_arrays(): failed to create airfoil")
+    return newairfoil.contents
 
 
 lib.analytic_polar_curves.argtypes = [ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_double,
                                     ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_double,
                                     ctypes.c_double, ctypes.c_double]
 lib.analytic_polar_curves.restype = ctypes.POINTER(Airfoil)
+_analytic_polar_cache = collections.OrderedDict()     #generated airfoils, keyed by the model coefficients
+_analytic_polar_cache_maxsize = 64
+_analytic_polar_refs = {}       #number of callers holding each generated airfoil, keyed by its address
 def analytic_polar_curves(CL0, CL_a, CLmin, CLmax, CD0, CD2u, CD2l, CLCD0, REref, REexp):
     """
     ANALYTIC_POLAR_CURVES generates polars using the simple analytic model
@@ -290,10 +566,50 @@ def analytic_polar_curves(CL0, CL_a, CLmin, CLmax, CD0, CD2u, CD2l, CLCD0, REref
         - REexp: Reynolds number exponent (default: -0.5)
     Output:
         - (Airfoil): generated polar curves
+    Notes:
+        - the output is cached: calling this function again with the same
+          coefficients returns the same (shared) Airfoil without regenerating it
+        - call free_airfoil once for each call to this function: the shared airfoil
+          is released after the last free_airfoil, so earlier ones never double-free it
+        - up to 64 airfoils are kept in the cache; older entries are dropped from
+          the cache (but not freed) and are still released by free_airfoil
+        - alternatively, clear_polar_cache frees all the cached airfoils at once:
+          in that case, do not call free_airfoil on them
     Example:
         myairfoil = analytic_polar_curves(0.50, 5.8, -0.3, 1.2, 0.028, 0.050, 0.020, 0.5, 70000, -0.7)
     """
-    return lib.analytic_polar_curves(CL0, CL_a, CLmin, CLmax, CD0, CD2u, CD2l, CLCD0, REref, REexp).contents
+    key = tuple(float(x) for x in (CL0, CL_a, CLmin, CLmax, CD0, CD2u, CD2l, CLCD0, REref, REexp))
+    if key in _analytic_polar_cache:
+        _analytic_polar_cache.move_to_end(key)
+        cachedairfoil = _analytic_polar_cache[key]
+        _analytic_polar_refs[ctypes.addressof(cachedairfoil)] += 1
+        return cachedairfoil
+    newairfoil = lib.analytic_polar_curves(*key)
+    if not newairfoil:
+        raise RuntimeError("ERROR in analytic_polar_curves(): failed to generate polars")
+    newairfoil = newairfoil.contents
+    _analytic_polar_cache[key] = newairfoil
+    _analytic_polar_refs[ctypes.addressof(newairfoil)] = 1
+    if len(_analytic_polar_cache) > _analytic_polar_cache_maxsize:
+        _analytic_polar_cache.popitem(last=False)
+    return newairfoil
+
+
+def clear_polar_cache():
+    """
+    CLEAR_POLAR_CACHE frees all the airfoils cached by analytic_polar_curves
+    Input:
+        - none
+    Output:
+        - none
+    Notes:
+        - rotors built with the cached airfoils must not be used afterwards
+        - the cached airfoils must not be freed again with free_airfoil
+    """
+    while _analytic_polar_cache:
+        _, cachedairfoil = _analytic_polar_cache.popitem()
+        _analytic_polar_refs.pop(ctypes.addressof(cachedairfoil), None)
+        lib.free_airfoil(ctypes.byref(cachedairfoil))
 
 
 lib.import_rotor_geometry_apc.argtypes = [ctypes.c_char_p, ctypes.POINTER(Airfoil)]
@@ -313,7 +629,10 @@ def import_rotor_geometry_apc(filename, airfoil):
         myairfoil = import_xfoil_polars(airfoil_filenames)
         myrotor = import_rotor_geometry_apc("10x7SF-PERF.PE0", myairfoil)
     """
-    return lib.import_rotor_geometry_apc(filename.encode(), ctypes.byref(airfoil)).contents
+    newrotor = lib.import_rotor_geometry_apc(filename.encode(), ctypes.byref(airfoil))
+    if not newrotor:
+        raise RuntimeError("ERROR in import_rotor_geometry_apc(): failed to read geometry from file")
+    return newrotor.contents
 
 
 lib.import_rotor_geometry_uiuc.argtypes = [ctypes.c_char_p, ctypes.POINTER(Airfoil), ctypes.c_double, ctypes.c_int]
@@ -335,7 +654,59 @@ def import_rotor_geometry_uiuc(filename, airfoil, D, B):
         myairfoil = import_xfoil_polars(airfoil_filenames)
         myrotor = import_rotor_geometry_uiuc("apcsf_10x7_geom.txt", myairfoil, 10*0.0254, 2)
     """
-    return lib.import_rotor_geometry_uiuc(filename.encode(), ctypes.byref(airfoil), D, B).contents
+    newrotor = lib.import_rotor_geometry_uiuc(filename.encode(), ctypes.byref(airfoil), D, B)
+    if not newrotor:
+        raise RuntimeError("ERROR in import_rotor_geometry_uiuc(): failed to read geometry from file")
+    return newrotor.contents
+
+
+lib.create_rotor_from_arrays.argtypes = [ctypes.c_double, ctypes.c_int, ctypes.c_int,
+                                         ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double),
+                                         ctypes.POINTER(Airfoil), ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+lib.create_rotor_from_arrays.restype = ctypes.POINTER(Rotor)
+def create_rotor_from_arrays(D, B, c, beta, r, airfoils, airfoil_idx=None):
+    """
+    CREATE_ROTOR_FROM_ARRAYS creates a propeller geometry from arrays of section properties
+    Input:
+        - D: rotor diameter (m)
+        - B: number of blades
+        - c: array of chord lengths (m), from hub to tip
+        - beta: array of twist angles (rad) - same size as c
+        - r: array of radial distances (m) - same size as c
+        - airfoils (Airfoil or list of Airfoil): airfoils used along the blade
+        - airfoil_idx: index of the airfoil used by each section - same size as c
+          (default: all sections use the first airfoil)
+    Output:
+        - (Rotor): rotor geometry with the given properties
+    Notes:
+        - all sections are built with a single call to the C library
+        - the rotor is allocated by the C library: free it by calling free_rotor(Rotor)
+    Example:
+        r = [0.01905, 0.0254, 0.0381, 0.0508, 0.0635, 0.073025, 0.0762]
+        c = [0.016764, 0.017526, 0.016002, 0.01397, 0.011176, 0.00762, 0.004826]
+        beta = deg2rad([27.5, 22.0, 15.2, 10.2, 6.5, 4.6, 4.2])
+        airfoil_idx = [0, 0, 0, 0, 0, 1, 1]
+        myrotor = create_rotor_from_arrays(2*r[-1], 2, c, beta, r, [myairfoil1, myairfoil2], airfoil_idx)
+    """
+    if isinstance(airfoils, Airfoil):
+        airfoils = [airfoils]
+    nsections = len(r)
+    airfoils_array = (Airfoil * len(airfoils))()
+    for i in range(len(airfoils)):
+        airfoils_array[i] = airfoils[i]
+    airfoil_idx_array = None
+    if airfoil_idx is not None:
+        airfoil_idx_array = _as_c_array(airfoil_idx, nsections, ctypes.c_int, "i")
+    newrotor = lib.create_rotor_from_arrays(
+        D, B, nsections,
+        _as_c_array(c, nsections),
+        _as_c_array(beta, nsections),
+        _as_c_array(r, nsections),
+        airfoils_array, len(airfoils), airfoil_idx_array
+    )
+    if not newrotor:
+        raise RuntimeError("ERROR in create_rotor_from_arrays(): failed to build rotor")
+    return newrotor.contents
 
 
 lib.refine_rotor_sections.argtypes = [ctypes.POINTER(Rotor), ctypes.c_int]
@@ -355,7 +726,10 @@ def refine_rotor_sections(oldrotor, nsections):
         reference_rotor = import_rotor_geometry_uiuc("apcsf_10x7_geom.txt", myairfoil, 10*0.0254, 2)
         myrotor = refine_rotor_sections(reference_rotor, 100)
     """
-    return lib.refine_rotor_sections(ctypes.byref(oldrotor), nsections).contents
+    newrotor = lib.refine_rotor_sections(ctypes.byref(oldrotor), nsections)
+    if not newrotor:
+        raise RuntimeError("ERROR in refine_rotor_sections(): failed to discretize geometry")
+    return newrotor.contents
 
 
 lib.free_rotor.argtypes = [ctypes.POINTER(Rotor)]
@@ -371,9 +745,37 @@ def free_rotor(currentrotor):
     lib.free_rotor(ctypes.byref(currentrotor))
 
 
+lib.alloc_rotor_performance.argtypes = [ctypes.c_int]
+lib.alloc_rotor_performance.restype = ctypes.POINTER(RotorPerformance)
+def alloc_rotor_performance(nelems):
+    """
+    ALLOC_ROTOR_PERFORMANCE allocates a qprop output that can be reused across qprop calls
+    Input:
+        - nelems: number of elements discretizing a blade (rotor.nsections - 1)
+    Output:
+        - (RotorPerformance): zero-initialized qprop output
+    Notes:
+        - the output can be used as a context manager, which frees it on exit;
+          otherwise free it by calling free_rotor_performance(RotorPerformance)
+    Example:
+        with alloc_rotor_performance(myrotor.nsections - 1) as results:
+            for rpm in [4000, 5000, 6000]:
+                qprop(myrotor, 0.0, rpm*pi/30, out=results)
+                print(results.T)
+    """
+    perf = lib.alloc_rotor_performance(nelems)
+    if not perf:
+        raise RuntimeError("ERROR in alloc_rotor_performance(): memory allocation error")
+    return perf.contents
+
+
+lib.qprop_into.argtypes = [ctypes.POINTER(Rotor), ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_int, ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.POINTER(RotorPerformance)]
+lib.qprop_into.restype = ctypes.c_int
+lib.qprop_into_warm.argtypes = [ctypes.POINTER(Rotor), ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_int, ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.POINTER(RotorPerformance), ctypes.POINTER(ctypes.c_double)]
+lib.qprop_into_warm.restype = ctypes.c_int
 lib.qprop.argtypes = [ctypes.POINTER(Rotor), ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_int, ctypes.c_double, ctypes.c_double, ctypes.c_double]
 lib.qprop.restype = ctypes.POINTER(RotorPerformance)
-def qprop(rotor, Uinf, Omega, tol=1e-6, itmax=100, rho=1.225, mu=1.81e-5, a=0.0):
+def qprop(rotor, Uinf, Omega, tol=1e-6, itmax=100, rho=1.225, mu=1.81e-5, a=0.0, out=None, psi=None):
     """
     QPROP runs the QProp algorithm as described by Drela for each blade element
     Input:
@@ -385,13 +787,170 @@ def qprop(rotor, Uinf, Omega, tol=1e-6, itmax=100, rho=1.225, mu=1.81e-5, a=0.0)
         - rho: air density in kg/m3 (default: 1.225)
         - mu: air dynamic viscosity in Pa-s (default: 1.81e-5)
         - a: speed of sound in m/s (default: 0.0) - set to 0 to disable Mach correction
+        - out (RotorPerformance): optional output from alloc_rotor_performance,
+          reused instead of allocating a new one (default: None)
+        - psi: optional float64 NumPy array (or ctypes array) with the inflow angle
+          parameter of each element, used to warm start the iterations and
+          overwritten with the converged values (default: None)
     Output:
         - (RotorPerformance): data structure containing the QProp outputs
     Notes:
         - the current implementation assumes that there is no externally-induced
           tangential velocity (Ut = 0)
+        - fill psi with NaN before the first call: elements with NaN are solved
+          from scratch, the following calls start from the previous solution
+        - with psi, each element converges to the root nearest the previous solution,
+          which is not guaranteed to be the root found from scratch
+    Example:
+        psi = numpy.full(myrotor.nsections - 1, numpy.nan)
+        with alloc_rotor_performance(myrotor.nsections - 1) as results:
+            for Uinf in [1.0, 1.5, 2.0]:
+                qprop(myrotor, Uinf, 5000*pi/30, out=results, psi=psi)
+                print(results.T)
+    """
+    if psi is not None:
+        nelems = rotor.nsections - 1
+        if len(psi) != nelems:
+            raise ValueError("ERROR in qprop(): psi must have one value per element ({})".format(nelems))
+        if not isinstance(psi, ctypes.Array):
+            if np is None or not isinstance(psi, np.ndarray) or psi.dtype != np.float64 \
+                        or not psi.flags.c_contiguous or not psi.flags.writeable:
+                raise ValueError("ERROR in qprop(): psi must be a writable float64 NumPy array or a ctypes array")
+            psi = _as_c_array(psi, nelems)
+        perf = out if out is not None else alloc_rotor_performance(nelems)
+        if lib.qprop_into_warm(ctypes.byref(rotor), Uinf, Omega, tol, itmax, rho, mu, a, ctypes.byref(perf), psi) != 0:
+            if out is None:
+                free_rotor_performance(perf)
+            raise RuntimeError("ERROR in qprop(): failed to run qprop iterations")
+        return perf
+    if out is not None:
+        if lib.qprop_into(ctypes.byref(rotor), Uinf, Omega, tol, itmax, rho, mu, a, ctypes.byref(out)) != 0:
+            raise RuntimeError("ERROR in qprop(): failed to run qprop iterations")
+        return out
+    perf = lib.qprop(ctypes.byref(rotor), Uinf, Omega, tol, itmax, rho, mu, a)
+    if not perf:
+        raise RuntimeError("ERROR in qprop(): failed to run qprop iterations")
+    return perf.contents
+
+
+def qprop_many(rotors, Uinf, Omega, tol=1e-6, itmax=100, rho=1.225, mu=1.81e-5, a=0.0):
+    """
+    QPROP_MANY runs qprop on multiple rotors in parallel threads
+    Input:
+        - rotors: list of rotor geometries
+        - Uinf: list of freestream velocities in m/s, one per rotor (or a single value for all the rotors)
+        - Omega: list of rotor speeds in rad/s, one per rotor (or a single value for all the rotors)
+        - tol: stopping criterion tolerance (default: 1e-6)
+        - itmax: maximum number of iterations (default: 100)
+        - rho: air density in kg/m3 (default: 1.225)
+        - mu: air dynamic viscosity in Pa-s (default: 1.81e-5)
+        - a: speed of sound in m/s (default: 0.0) - set to 0 to disable Mach correction
+    Output:
+        - (list of RotorPerformance): QProp outputs, in the same order as rotors
+    Notes:
+        - the C library releases the GIL and keeps no global state, so the
+          analyses run truly in parallel, one rotor per thread
+        - airfoil polars that are not sorted by Re are sorted before starting the
+          threads, so that rotors sharing an airfoil only read it
+        - free each output by calling free_rotor_performance(RotorPerformance)
+    Example:
+        results = qprop_many([myrotor1, myrotor2], 5.0, 5000*pi/30)
+    """
+    nrotors = len(rotors)
+    if not hasattr(Uinf, "__len__"):
+        Uinf = [Uinf] * nrotors
+    if not hasattr(Omega, "__len__"):
+        Omega = [Omega] * nrotors
+    if len(Uinf) != nrotors or len(Omega) != nrotors:
+        raise ValueError("Uinf and Omega must have the same length as rotors")
+    #sort the airfoil polars upfront (like qprop_sweep in C), so that the threads never write them
+    for rotor in rotors:
+        for i in range(rotor.nsections):
+            airfoil = rotor.sections[i].airfoil
+            polars = [airfoil.polars[j].contents for j in range(airfoil.size)]
+            if any(polars[j].Re < polars[j-1].Re for j in range(1, airfoil.size)):
+                for j, polar in enumerate(sorted(polars, key=lambda polar: polar.Re)):
+                    airfoil.polars[j] = ctypes.pointer(polar)
+    def run(i):
+        return lib.qprop(ctypes.byref(rotors[i]), Uinf[i], Omega[i], tol, itmax, rho, mu, a)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(nrotors, os.cpu_count() or 1) or 1) as executor:
+        perfs = list(executor.map(run, range(nrotors)))
+    if not all(perfs):
+        for perf in perfs:
+            if perf:
+                lib.free_rotor_performance(perf)
+        raise RuntimeError("ERROR in qprop_many(): failed to run qprop iterations")
+    return [perf.contents for perf in perfs]
+
+
+lib.qprop_sweep.argtypes = [ctypes.POINTER(Rotor), ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double), ctypes.c_int,
+                            ctypes.c_double, ctypes.c_int, ctypes.c_double, ctypes.c_double, ctypes.c_double,
+                            ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double),
+                            ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double)]
+lib.qprop_sweep.restype = ctypes.c_int
+def qprop_sweep(rotor, Uinf, Omega, tol=1e-6, itmax=100, rho=1.225, mu=1.81e-5, a=0.0):
+    """
+    QPROP_SWEEP runs qprop at multiple operating points of the same rotor
+    Input:
+        - rotor (Rotor): rotor geometry
+        - Uinf: list of freestream velocities in m/s (or a single value for all the points)
+        - Omega: list of rotor speeds in rad/s (or a single value for all the points)
+        - tol: stopping criterion tolerance (default: 1e-6)
+        - itmax: maximum number of iterations (default: 100)
+        - rho: air density in kg/m3 (default: 1.225)
+        - mu: air dynamic viscosity in Pa-s (default: 1.81e-5)
+        - a: speed of sound in m/s (default: 0.0) - set to 0 to disable Mach correction
+    Output:
+        - (list of float): thrust in N at each operating point
+        - (list of float): torque in N-m at each operating point
+        - (list of float): thrust coefficient at each operating point
+        - (list of float): power coefficient at each operating point
+        - (list of float): advance ratio at each operating point
+    Notes:
+        - the whole sweep runs in a single C call
+        - the prebuilt binaries are single-threaded: to compute the points in parallel,
+          build the Linux library with OpenMP (QPROP_OPENMP=1 build/build.sh)
+        - all outputs are NaN at the points that did not converge
+        - if Uinf or Omega is a NumPy array, the outputs are NumPy arrays
+          written directly by the C library instead of lists
+    Example:
+        T, Q, CT, CP, J = qprop_sweep(myrotor, [1.0, 2.0, 3.0], 5000*pi/30)
+    """
+    if not hasattr(Uinf, "__len__"):
+        Uinf = [Uinf] * (len(Omega) if hasattr(Omega, "__len__") else 1)
+    if not hasattr(Omega, "__len__"):
+        Omega = [Omega] * len(Uinf)
+    if len(Uinf) != len(Omega):
+        raise ValueError("Uinf and Omega must have the same length")
+    npoints = len(Uinf)
+    Uinf_c = _as_c_array(Uinf, npoints)
+    Omega_c = _as_c_array(Omega, npoints)
+    if np is not None and (isinstance(Uinf, np.ndarray) or isinstance(Omega, np.ndarray)):
+        outputs = [np.empty(npoints) for _ in range(5)]             #T, Q, CT, CP, J
+        lib.qprop_sweep(ctypes.byref(rotor), Uinf_c, Omega_c, npoints, tol, itmax, rho, mu, a,
+                        *[_as_c_array(output, npoints) for output in outputs])
+        return tuple(outputs)
+    outputs = [(ctypes.c_double * npoints)() for _ in range(5)]     #T, Q, CT, CP, J
+    lib.qprop_sweep(ctypes.byref(rotor), Uinf_c, Omega_c, npoints, tol, itmax, rho, mu, a, *outputs)
+    return tuple(list(output) for output in outputs)
+
+
+lib.check_residuals.argtypes = [ctypes.POINTER(RotorPerformance), ctypes.c_double]
+lib.check_residuals.restype = ctypes.c_int
+def check_residuals(perf, tol=1e-6):
+    """
+    CHECK_RESIDUALS counts the blade elements that did not converge
+    Input:
+        - perf (RotorPerformance): qprop output
+        - tol: maximum admissible absolute residual (default: 1e-6)
+    Output:
+        - (int): number of elements whose absolute residual exceeds tol (0 if converged)
+    Example:
+        results = qprop(myrotor, Uinf, Omega)
+        if check_residuals(results, 1e-6):
+            print("ERROR while running qprop: convergence not reached in one or more elements")
     """
-    return lib.qprop(ctypes.byref(rotor), Uinf, Omega, tol, itmax, rho, mu, a).contents
+    return lib.check_residuals(ctypes.byref(perf), tol)
 
 
 lib.free_rotor_performance.argtypes = [ctypes.POINTER(RotorPerformance)]
@@ -19,7 +19,7 @@ def main():
     #define airfoil #1: Eppler E63
     airfoil1_polar_filenames = [
         os.path.join("./eppler_e63_Ncrit=6", filename) \
-        for filename in os.listdir("eppler_e63_Ncrit=6") \
+        for filename in sorted(os.listdir("eppler_e63_Ncrit=6")) \
         if filename.endswith(".txt")
     ]
     airfoil1 = qprop.import_xfoil_polars(airfoil1_polar_filenames)
@@ -27,7 +27,7 @@ def main():
     #define airfoil #2: NACA 4412
     airfoil2_polar_filenames = [
         os.path.join("./naca4412_Ncrit=6", filename) \
-        for filename in os.listdir("naca4412_Ncrit=6") \
+        for filename in sorted(os.listdir("naca4412_Ncrit=6")) \
         if filename.endswith(".txt")
     ]
     airfoil2 = qprop.import_xfoil_polars(airfoil2_polar_filenames)
@@ -35,34 +35,14 @@ def main():
     #define propeller geometry
     r = [0.01905, 0.0254, 0.0381, 0.0508, 0.0635, 0.073025, 0.0762]                 #radial stations (m)
     c = [0.016764, 0.017526, 0.016002, 0.01397, 0.011176, 0.00762, 0.004826]        #chord (m)
-    β = [qprop.deg2rad(deg) for deg in [27.5, 22.0, 15.2, 10.2, 6.5, 4.6, 4.2]]     #blade pitch angle (rad)
+    β = qprop.deg2rad([27.5, 22.0, 15.2, 10.2, 6.5, 4.6, 4.2])                      #blade pitch angle (rad)
 
     #define rotor sections
+    #use Eppler E63 (airfoil #0) for r <= 0.8*R and NACA-4412 (airfoil #1) for r > 0.8*R
     D = 2 * r[-1]                   #rotor diameter (m)
     B = 2                           #number of blades
-    nsections = len(r)              #number of blade sections
-    sections = []
-    for i in range(nsections):
-        if r[i] <= 0.8 * r[-1]:
-            #use Eppler E63 for r <= 0.8*R
-            newsection = qprop.create_section(
-                c[i],               #Element.c (m)
-                β[i],               #Element.beta (rad)
-                r[i],               #Element.r (m)
-                airfoil1            #Element.airfoil
-            )
-            sections.append(newsection)
-        else:
-            #use NACA-4412 for r > 0.8*R
-            newsection = qprop.create_section(
-                c[i],               #Element.c (m)
-                β[i],               #Element.beta (rad)
-                r[i],               #Element.r (m)
-                airfoil2            #Element.airfoil
-            )
-            sections.append(newsection)
-
-    myrotor = qprop.create_rotor(D, B, nsections, sections)
+    airfoil_idx = [0 if ri <= 0.8 * r[-1] else 1 for ri in r]
+    myrotor = qprop.create_rotor_from_arrays(D, B, c, β, r, [airfoil1, airfoil2], airfoil_idx)
 
     #run analysis
     Uinf = 0.00                     #airspeed (m/s)
@@ -70,10 +50,8 @@ def main():
     results = qprop.qprop(myrotor, Uinf, Ω)
 
     #check convergence
-    for i in range(nsections):
-        if abs(results.residuals[i]) > 1e-6:
-            print("ERROR while running qprop: convergence not reached in one or more elements")
-            break
+    if qprop.check_residuals(results, 1e-6):
+        print("ERROR while running qprop: convergence not reached in one or more elements")
 
     #print results
     print("qprop.c results:")
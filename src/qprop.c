@@ -39,6 +39,34 @@ double deg2rad(double deg) {
     return deg*PI/180.0;
 }
 
+//converts an array of angles from degrees to radians
+void deg2rad_array(const double* deg, double* rad, int n) {
+    for (int i=0; i<n; ++i) {
+        rad[i] = deg[i]*PI/180.0;
+    }
+}
+
+//split a string into tokens, like strtok but keeping the parser state in saveptr
+//unlike strtok, it can be called by multiple threads at the same time
+//INTERNAL USE ONLY
+char* next_token(char* str, const char* delims, char** saveptr) {
+    if (!str) {
+        str = *saveptr;
+    }
+    str += strspn(str, delims);         //skip leading delimiters
+    if (*str == '\0') {
+        *saveptr = str;
+        return NULL;
+    }
+    char* end = str + strcspn(str, delims);
+    if (*end != '\0') {
+        *end = '\0';
+        end += 1;
+    }
+    *saveptr = end;
+    return str;
+}
+
 //read xfoil polar from file
 //WARNING: the content of the file is not checked
 //the polar is supposed to start at min(alpha), go to 0 and finish at max(alpha)
@@ -70,24 +98,25 @@ Polar* read_xfoil_polar_from_file(const char *filename) {
         if (read_reynolds_number && strstr(line, "Re =")) {     //if line contains "Re ="
             //line now is looking like this:
             //line = " Mach =   0.000     Re =     0.300 e 6     Ncrit =   9.000";
-            char* token = strtok(line, " ");                    //split line into tokens
+            char* saveptr = NULL;
+            char* token = next_token(line, " ", &saveptr);      //split line into tokens
             while (token) {
                 //printf("Token: %s\n", token);
                 if (strcmp(token, "Re") == 0) {
                     //found the "Re" token
-                    token = strtok(NULL, " ");                  //get the next token "="
-                    token = strtok(NULL, " ");                  //get the next token "0.300"
+                    token = next_token(NULL, " ", &saveptr);    //get the next token "="
+                    token = next_token(NULL, " ", &saveptr);    //get the next token "0.300"
                     double mantissa = atof(token);
                     double exponent = 0.0;
-                    token = strtok(NULL, " ");                  //get the next token "e"
+                    token = next_token(NULL, " ", &saveptr);    //get the next token "e"
                     if (strcmp(token, "e") == 0) {
-                        token = strtok(NULL, " ");              //get the next token "6"
+                        token = next_token(NULL, " ", &saveptr);    //get the next token "6"
                         exponent = atof(token);
                     }
                     newpolar->Re = mantissa*pow(10,exponent);
                     break;
                 }
-                token = strtok(NULL, " ");                      //get the next token
+                token = next_token(NULL, " ", &saveptr);        //get the next token
             }
             read_reynolds_number = false;
         }
@@ -97,7 +126,8 @@ Polar* read_xfoil_polar_from_file(const char *filename) {
             //line now is looking like this:
             //line = "   0.000   0.8022   0.01019   0.00422  -0.1836   0.7434   0.5993";
             //printf("line = \"%s\"\n",line);
-            char* token = strtok(line, " ");                    //split line into tokens
+            char* saveptr = NULL;
+            char* token = next_token(line, " ", &saveptr);      //split line into tokens
             if (!token || strlen(token)<=2) {
                 //empty line
                 break;
@@ -111,9 +141,9 @@ Polar* read_xfoil_polar_from_file(const char *filename) {
 
             //set the last element of alpha, CL, CD
             newpolar->alpha[newpolar->size-1] = deg2rad(atof(token));
-            token = strtok(NULL, " ");                          //get the next token "0.8022"
+            token = next_token(NULL, " ", &saveptr);            //get the next token "0.8022"
             newpolar->CL[newpolar->size-1] = atof(token);
-            token = strtok(NULL, " ");                          //get the next token "0.01019"
+            token = next_token(NULL, " ", &saveptr);            //get the next token "0.01019"
             newpolar->CD[newpolar->size-1] = atof(token);
         }
 
@@ -183,10 +213,12 @@ void sort_airfoil_polars(Airfoil* currentairfoil)
             }
         }
 
-        //place smallest Re first
-        Polar* tmp = currentairfoil->polars[i];
-        currentairfoil->polars[i] = currentairfoil->polars[lowest_idx];
-        currentairfoil->polars[lowest_idx] = tmp;
+        //place smallest Re first (polars already in place are not written)
+        if (lowest_idx != i) {
+            Polar* tmp = currentairfoil->polars[i];
+            currentairfoil->polars[i] = currentairfoil->polars[lowest_idx];
+            currentairfoil->polars[lowest_idx] = tmp;
+        }
     }
     return;
 }
@@ -223,6 +255,78 @@ Airfoil* import_xfoil_polars(const char *filenames[], int number_of_files) {
     return newairfoil;
 }
 
+//build an airfoil from polars that have already been allocated
+//NOTE: the airfoil takes ownership of the polars, which are freed by free_airfoil
+Airfoil* create_airfoil_from_polars(Polar** polars, int npolars) {
+    Airfoil* newairfoil = calloc(1, sizeof(Airfoil));
+    if (!newairfoil) {
+        printf("ERROR: memory allocation error in create_airfoil_from_polars()\n");
+        return NULL;
+    }
+    newairfoil->polars = calloc(npolars, sizeof(Polar*));
+    if (!newairfoil->polars) {
+        printf("ERROR: memory allocation error in create_airfoil_from_polars()\n");
+        free(newairfoil);
+        return NULL;
+    }
+    for (int i=0; i<npolars; ++i) {
+        newairfoil->polars[i] = polars[i];
+    }
+    newairfoil->size = npolars;
+
+    //sort polars from lowest to highest Re
+    sort_airfoil_polars(newairfoil);
+
+    return newairfoil;
+}
+
+//build an airfoil by copying polars stored back to back in flat arrays
+Airfoil* create_airfoil_from_arrays(const double* Re, const double* alpha, const double* CL, const double* CD, const int* sizes, int npolars) {
+    Polar** polars = calloc(npolars, sizeof(Polar*));
+    if (!polars) {
+        printf("ERROR: memory allocation error in create_airfoil_from_arrays()\n");
+        return NULL;
+    }
+    int offset = 0;
+    for (int i=0; i<npolars; ++i) {
+        polars[i] = calloc(1, sizeof(Polar));
+        if (!polars[i]) {
+            printf("ERROR: memory allocation error in create_airfoil_from_arrays()\n");
+            for (int j=0; j<i; ++j) {
+                free_polar(polars[j]);
+            }
+            free(polars);
+            return NULL;
+        }
+        polars[i]->Re = Re[i];
+        polars[i]->alpha = calloc(sizes[i], sizeof(double));
+        polars[i]->CL = calloc(sizes[i], sizeof(double));
+        polars[i]->CD = calloc(sizes[i], sizeof(double));
+        polars[i]->size = sizes[i];
+        if (!polars[i]->alpha || !polars[i]->CL || !polars[i]->CD) {
+            printf("ERROR: memory allocation error in create_airfoil_from_arrays()\n");
+            for (int j=0; j<=i; ++j) {
+                free_polar(polars[j]);
+            }
+            free(polars);
+            return NULL;
+        }
+        memcpy(polars[i]->alpha, alpha+offset, sizes[i]*sizeof(double));
+        memcpy(polars[i]->CL, CL+offset, sizes[i]*sizeof(double));
+        memcpy(polars[i]->CD, CD+offset, sizes[i]*sizeof(double));
+        offset += sizes[i];
+    }
+
+    Airfoil* newairfoil = create_airfoil_from_polars(polars, npolars);
+    if (!newairfoil) {
+        for (int i=0; i<npolars; ++i) {
+            free_polar(polars[i]);
+        }
+    }
+    free(polars);
+    return newairfoil;
+}
+
 //generate polars using the simple analytic model described by Drela in the QPROP user guide
 Airfoil* analytic_polar_curves(double CL0, double CL_a, double CLmin, double CLmax,
                               double CD0, double CD2u, double CD2l, double CLCD0,
@@ -297,14 +401,9 @@ typedef struct {
     double CD;
 } PolarPoint;
 
-//interpolate airfoil coefficient across a polar
+//interpolate airfoil coefficient across a polar, writing the result in a preallocated point
 //INTERNAL USE ONLY
-PolarPoint* interpolate_polar(Polar* currentpolar, double alpha) {
-    PolarPoint* query = calloc(1, sizeof(PolarPoint));
-    if (!query) {
-        printf("ERROR: memory allocation error in interpolate_polar()\n");
-        return NULL;
-    }
+void interpolate_polar_into(PolarPoint* query, Polar* currentpolar, double alpha) {
     query->alpha = alpha;
     query->CL = 0.0;
     query->CD = 0.0;
@@ -323,7 +422,7 @@ PolarPoint* interpolate_polar(Polar* currentpolar, double alpha) {
         //ALTERNATIVE: constant cap on the left
         //query->CL = currentpolar->CL[0];
         //query->CD = currentpolar->CD[0];
-        return query;
+        return;
     }
     else if (alpha > currentpolar->alpha[currentpolar->size-1]) {
         //above maximum AoA
@@ -339,41 +438,55 @@ PolarPoint* interpolate_polar(Polar* currentpolar, double alpha) {
         //ALTERNATIVE: constant cap on the right
         //query->CL = currentpolar->CL[currentpolar->size-1];
         //query->CD = currentpolar->CD[currentpolar->size-1];
-        return query;
+        return;
     }
     
-    //interpolate between two alpha
-    for (int i=1; i<(currentpolar->size); ++i) {
-        if (currentpolar->alpha[i-1] < alpha && alpha <= currentpolar->alpha[i]) {
-            query->CL = interp1(
-                currentpolar->alpha[i-1],       //x1
-                currentpolar->CL[i-1],          //y1
-                currentpolar->alpha[i],         //x2
-                currentpolar->CL[i],            //y2
-                alpha                           //xq
-            );
-            query->CD = interp1(
-                currentpolar->alpha[i-1],       //x1
-                currentpolar->CD[i-1],          //y1
-                currentpolar->alpha[i],         //x2
-                currentpolar->CD[i],            //y2
-                alpha                           //xq
-            );
-            break;
+    //find the two alpha around the query by binary search, so that alpha[i-1] < alpha <= alpha[i]
+    int lo = 0;
+    int i = currentpolar->size - 1;
+    while (i - lo > 1) {
+        int mid = (lo + i) / 2;
+        if (currentpolar->alpha[mid] < alpha) {
+            lo = mid;
+        }
+        else {
+            i = mid;
         }
     }
-    return query;
+
+    //interpolate between two alpha
+    query->CL = interp1(
+        currentpolar->alpha[i-1],       //x1
+        currentpolar->CL[i-1],          //y1
+        currentpolar->alpha[i],         //x2
+        currentpolar->CL[i],            //y2
+        alpha                           //xq
+    );
+    query->CD = interp1(
+        currentpolar->alpha[i-1],       //x1
+        currentpolar->CD[i-1],          //y1
+        currentpolar->alpha[i],         //x2
+        currentpolar->CD[i],            //y2
+        alpha                           //xq
+    );
 }
 
-//interpolate airfoil polars
+//interpolate airfoil coefficient across a polar
 //INTERNAL USE ONLY
-PolarPoint* interpolate_airfoil_polars(Airfoil* currentairfoil, double alpha, double Re, double Mach) {
-    //find the two polars that bracket the query point
+PolarPoint* interpolate_polar(Polar* currentpolar, double alpha) {
     PolarPoint* query = calloc(1, sizeof(PolarPoint));
     if (!query) {
-        printf("ERROR: memory allocation error in interpolate_airfoil_polars()\n");
+        printf("ERROR: memory allocation error in interpolate_polar()\n");
         return NULL;
     }
+    interpolate_polar_into(query, currentpolar, alpha);
+    return query;
+}
+
+//interpolate airfoil polars, writing the result in a preallocated point
+//INTERNAL USE ONLY
+void interpolate_airfoil_polars_into(PolarPoint* query, Airfoil* currentairfoil, double alpha, double Re, double Mach) {
+    //find the two polars that bracket the query point
     query->alpha = alpha;
     query->CL = 0.0;
     query->CD = 0.0;
@@ -400,26 +513,26 @@ PolarPoint* interpolate_airfoil_polars(Airfoil* currentairfoil, double alpha, do
     }
 
     //interpolate across alpha at the lower and upper polars
-    PolarPoint* lower = interpolate_polar(currentairfoil->polars[lower_polar_idx], alpha);
-    PolarPoint* upper = interpolate_polar(currentairfoil->polars[upper_polar_idx], alpha);
+    PolarPoint lower;
+    PolarPoint upper;
+    interpolate_polar_into(&lower, currentairfoil->polars[lower_polar_idx], alpha);
+    interpolate_polar_into(&upper, currentairfoil->polars[upper_polar_idx], alpha);
 
     //interpolate across Re
     query->CL = interp1(
         currentairfoil->polars[lower_polar_idx]->Re,    //x1
-        lower->CL,                                      //y1
+        lower.CL,                                       //y1
         currentairfoil->polars[upper_polar_idx]->Re,    //x2
-        upper->CL,                                      //y2
+        upper.CL,                                       //y2
         Re                                              //xq
     );
     query->CD = interp1(
         currentairfoil->polars[lower_polar_idx]->Re,    //x1
-        lower->CD,                                      //y1
+        lower.CD,                                       //y1
         currentairfoil->polars[upper_polar_idx]->Re,    //x2
-        upper->CD,                                      //y2
+        upper.CD,                                       //y2
         Re                                              //xq
     );
-    free(lower);
-    free(upper);
 
     //optional: correct for Mach number using the Prantdl-Meyer compressibility factor
     //set Mach = 0 to disable correction
@@ -429,6 +542,17 @@ PolarPoint* interpolate_airfoil_polars(Airfoil* currentairfoil, double alpha, do
         //no warning will be issued, as this call may be part of an inner iteration
         //it is the user's responsibility to perform a sanity check on the final result
     }
+}
+
+//interpolate airfoil polars
+//INTERNAL USE ONLY
+PolarPoint* interpolate_airfoil_polars(Airfoil* currentairfoil, double alpha, double Re, double Mach) {
+    PolarPoint* query = calloc(1, sizeof(PolarPoint));
+    if (!query) {
+        printf("ERROR: memory allocation error in interpolate_airfoil_polars()\n");
+        return NULL;
+    }
+    interpolate_airfoil_polars_into(query, currentairfoil, alpha, Re, Mach);
     return query;
 }
 
@@ -446,6 +570,16 @@ void push_rotor_section(Rotor* rotor, double c, double beta, double r, Airfoil*
     rotor->sections[rotor->nsections-1].airfoil = *airfoil;
 }
 
+//fill an array of sections that share the same airfoil
+void create_sections(Section* sections, int nsections, const double* c, const double* beta, const double* r, Airfoil* airfoil) {
+    for (int i=0; i<nsections; ++i) {
+        sections[i].c = c[i];
+        sections[i].beta = beta[i];
+        sections[i].r = r[i];
+        sections[i].airfoil = *airfoil;
+    }
+}
+
 //read propeller geometry from APC PE0 file
 Rotor* import_rotor_geometry_apc(const char *filename, Airfoil* airfoil) {
     Rotor* newrotor = calloc(1, sizeof(Rotor));
@@ -545,9 +679,10 @@ Rotor* import_rotor_geometry_apc(const char *filename, Airfoil* airfoil) {
 
         //read number of blades
         if (newrotor->B == 0 && strstr(line, "BLADES:")) {
-            char* token = strtok(line, " ");
+            char* saveptr = NULL;
+            char* token = next_token(line, " ", &saveptr);
             if (strcmp(token, "BLADES:") == 0) {
-                token = strtok(NULL, " ");              //get the next token
+                token = next_token(NULL, " ", &saveptr);    //get the next token
                 newrotor->B = atof(token);
             }
         }
@@ -719,6 +854,40 @@ Rotor* refine_rotor_sections(Rotor* oldrotor, int nsections) {
     return newrotor;
 }
 
+//create a rotor from arrays of section properties
+Rotor* create_rotor_from_arrays(double D, int B, int nsections, const double* c, const double* beta, const double* r,
+                                Airfoil* airfoils, int nairfoils, const int* airfoil_idx) {
+    Rotor* newrotor = calloc(1, sizeof(Rotor));
+    if (!newrotor) {
+        printf("ERROR: memory allocation error in create_rotor_from_arrays()\n");
+        return NULL;
+    }
+    newrotor->D = D;
+    newrotor->B = B;
+    newrotor->nsections = nsections;
+    newrotor->sections = (Section*) calloc(nsections, sizeof(Section));
+    if (!newrotor->sections) {
+        printf("ERROR: memory allocation error in create_rotor_from_arrays()\n");
+        free(newrotor);
+        return NULL;
+    }
+
+    //copy section properties
+    for (int i=0; i<nsections; ++i) {
+        int idx = (airfoil_idx)? airfoil_idx[i] : 0;
+        if (idx < 0 || idx >= nairfoils) {
+            printf("ERROR in create_rotor_from_arrays(): section #%i refers to airfoil #%i, but only %i airfoils were provided\n", i, idx, nairfoils);
+            free_rotor(newrotor);
+            return NULL;
+        }
+        newrotor->sections[i].c = c[i];
+        newrotor->sections[i].beta = beta[i];
+        newrotor->sections[i].r = r[i];
+        newrotor->sections[i].airfoil = airfoils[idx];
+    }
+    return newrotor;
+}
+
 //free allocated memory on a Rotor
 void free_rotor(Rotor* currentrotor) {
     free(currentrotor->sections);
@@ -797,7 +966,8 @@ void residual(ResidualOutput* output, double psi, ResidualArgs* args) {
 
     //interpolate airfoil aerodynamic coefficients
     double Mach = (a > 0)? sqrt(output->W/a) : 0.0;
-    PolarPoint* operatingpoint = interpolate_airfoil_polars(currentelement->airfoil, alpha, Re, Mach);
+    PolarPoint operatingpoint;
+    interpolate_airfoil_polars_into(&operatingpoint, currentelement->airfoil, alpha, Re, Mach);
 
     //calculate tip losses
     output->lambdaw = ((currentelement->r)/R)*(Wa/Wt);
@@ -810,10 +980,9 @@ void residual(ResidualOutput* output, double psi, ResidualArgs* args) {
 
     //determine circulation and rotor coefficients
     output->Gamma = output->vt * (4.0*PI*(currentelement->r) / B) * F * sqrt(1.0 + pow(4*output->lambdaw*R/(PI*B*(currentelement->r)), 2));
-    output->residual = output->Gamma - 0.5 * output->W * (currentelement->c) * operatingpoint->CL;
-    output->Cn = operatingpoint->CL* Wt / output->W - operatingpoint->CD * Wa / output->W;
-    output->Ct = operatingpoint->CL* Wa / output->W + operatingpoint->CD * Wt / output->W;
-    free(operatingpoint);
+    output->residual = output->Gamma - 0.5 * output->W * (currentelement->c) * operatingpoint.CL;
+    output->Cn = operatingpoint.CL* Wt / output->W - operatingpoint.CD * Wa / output->W;
+    output->Ct = operatingpoint.CL* Wa / output->W + operatingpoint.CD * Wt / output->W;
 }
 
 //wrap the residual function so it can be passed to fzero
@@ -824,11 +993,9 @@ double residual_wrapper(double psi, void* args) {
     return output.residual;
 }
 
-//find the root of a function f(x)=0 using the bisection method
+//find the root of a function f(x)=0 using the bisection method, given the values fa=f(a) and fb=f(b)
 //INTERNAL USE ONLY
-double fzero(double (*f)(double x, void* args), double a, double b, double tol, int itmax, void* args) {
-    double fa = f(a, args);
-    double fb = f(b, args);
+double fzero_bracketed(double (*f)(double x, void* args), double a, double b, double fa, double fb, double tol, int itmax, void* args) {
     if (fa*fb > 0) {
         printf("ERROR when using fzero: f(a) and f(b) must have opposite signs\n");
         return a;
@@ -862,15 +1029,83 @@ double fzero(double (*f)(double x, void* args), double a, double b, double tol,
     return c;
 }
 
-//run qprop iterations
-RotorPerformance* qprop(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a) {
-    //initialize variables
+//find the root of a function f(x)=0 using the bisection method
+//INTERNAL USE ONLY
+double fzero(double (*f)(double x, void* args), double a, double b, double tol, int itmax, void* args) {
+    return fzero_bracketed(f, a, b, f(a, args), f(b, args), tol, itmax, args);
+}
+
+//find the root of a function f(x)=0 close to an initial guess, using the bisection method
+//the bracket around the guess is enlarged until f changes sign, falling back to the whole interval [a,b]
+//the root found is the one nearest the guess, which is not necessarily the one found by fzero(f, a, b)
+//INTERNAL USE ONLY
+double fzero_guess(double (*f)(double x, void* args), double guess, double a, double b, double tol, int itmax, void* args) {
+    //f(a) and f(b) are evaluated at most once, when the bracket reaches the ends of the interval
+    double fa = 0.0;
+    double fb = 0.0;
+    int fa_known = 0;
+    int fb_known = 0;
+    if (guess > a && guess < b) {
+        for (double h=1e-2; h<(b-a); h*=4) {
+            double lo = guess-h;
+            double flo;
+            if (lo <= a) {
+                lo = a;
+                if (!fa_known) {
+                    fa = f(a, args);
+                    fa_known = 1;
+                }
+                flo = fa;
+            }
+            else {
+                flo = f(lo, args);
+            }
+            double hi = guess+h;
+            double fhi;
+            if (hi >= b) {
+                hi = b;
+                if (!fb_known) {
+                    fb = f(b, args);
+                    fb_known = 1;
+                }
+                fhi = fb;
+            }
+            else {
+                fhi = f(hi, args);
+            }
+            if (flo*fhi <= 0) {
+                return fzero_bracketed(f, lo, hi, flo, fhi, tol, itmax, args);
+            }
+        }
+    }
+    if (!fa_known) {
+        fa = f(a, args);
+    }
+    if (!fb_known) {
+        fb = f(b, args);
+    }
+    return fzero_bracketed(f, a, b, fa, fb, tol, itmax, args);
+}
+
+//sort airfoil polars only if they are not already sorted from lowest to highest Re
+//polars with the same Re count as sorted, so that sorted airfoils are never written
+//INTERNAL USE ONLY
+void ensure_sorted_airfoil_polars(Airfoil* currentairfoil) {
+    for (int j=1; j<currentairfoil->size; ++j) {
+        if (currentairfoil->polars[j]->Re < currentairfoil->polars[j-1]->Re) {
+            //j-th polar has a lower Reynolds number than the preceding polar
+            sort_airfoil_polars(currentairfoil);
+            break;
+        }
+    }
+}
+
+//allocate the output of qprop for a blade with the given number of elements
+RotorPerformance* alloc_rotor_performance(int nelems) {
     RotorPerformance* perf = calloc(1, sizeof(RotorPerformance));
     if (!perf) {
-        printf("ERROR: memory allocation error in qprop()\n");
         return NULL;
     }
-    int nelems = rotor->nsections - 1;      //number of elements discretizing the blade
     perf->T = 0.0;
     perf->Q = 0.0;
     perf->CT = 0.0;
@@ -885,6 +1120,35 @@ RotorPerformance* qprop(Rotor* rotor, double Uinf, double Omega, double tol, int
     perf->dTdr = calloc(nelems, sizeof(double));
     perf->dQdr = calloc(nelems, sizeof(double));
     perf->nelems = nelems;
+    if (!perf->residuals || !perf->Gamma || !perf->lambdaw || !perf->r
+            || !perf->W || !perf->phi || !perf->dTdr || !perf->dQdr) {
+        free_rotor_performance(perf);
+        return NULL;
+    }
+    return perf;
+}
+
+//run qprop iterations, writing the results in a preallocated output
+//returns 0 on success
+int qprop_into(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a, RotorPerformance* perf) {
+    return qprop_into_warm(rotor, Uinf, Omega, tol, itmax, rho, mu, a, perf, NULL);
+}
+
+//run qprop iterations starting from the inflow angles psi of a nearby operating point
+//psi is updated with the converged values, so it can be passed to the next call
+//returns 0 on success
+int qprop_into_warm(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a, RotorPerformance* perf, double* psi) {
+    //initialize variables
+    int nelems = rotor->nsections - 1;      //number of elements discretizing the blade
+    if (perf->nelems != nelems) {
+        printf("ERROR in qprop_into(): the output has %i elements, but the rotor has %i\n", perf->nelems, nelems);
+        return -1;
+    }
+    perf->T = 0.0;
+    perf->Q = 0.0;
+    perf->CT = 0.0;
+    perf->CP = 0.0;
+    perf->J = 0.0;
 
     //iterate over each element in the blade
     for (int i=0; i<nelems; ++i) {
@@ -900,25 +1164,22 @@ RotorPerformance* qprop(Rotor* rotor, double Uinf, double Omega, double tol, int
         //
 
         //check airfoil polars
-        for (int j=1; j<currentelement.airfoil->size; ++j) {
-            if (currentelement.airfoil->polars[j]->Re <= currentelement.airfoil->polars[j-1]->Re) {
-                //j-th polar has a lower Reynolds number than the preceding polar
-                sort_airfoil_polars(currentelement.airfoil);
-                break;
-            }
-        }
+        ensure_sorted_airfoil_polars(currentelement.airfoil);
         
         //find the value of psi that makes the residual function equal to zero
         ResidualArgs args = {Uinf, Omega*currentelement.r, rotor->D/2, rotor->B, &currentelement, rho, mu, a};
-        double psi = fzero(residual_wrapper, -PI/2, +PI/2, tol, itmax, &args);
+        double psi_i = (psi)? fzero_guess(residual_wrapper, psi[i], -PI/2, +PI/2, tol, itmax, &args)
+                            : fzero(residual_wrapper, -PI/2, +PI/2, tol, itmax, &args);
+        if (psi) {
+            psi[i] = psi_i;
+        }
 
         //calculate element thrust and torque
         ResidualOutput res;     //= {0.0, 0.0, 0.0, 0, NULL, 0.0, 0.0, 0.0}
-        residual(&res, psi, &args);
+        residual(&res, psi_i, &args);
         if (fabs(res.residual) > tol) {
-            printf("ERROR when using qprop at blade location #%i: unable to find psi value that is zeroing the residual function (residual=%e exceeds tolerance=%e)\n", i, perf->residuals[i], tol);
-            free_rotor_performance(perf);
-            return NULL;
+            printf("ERROR when using qprop at blade location #%i: unable to find psi value that is zeroing the residual function (residual=%e exceeds tolerance=%e)\n", i, res.residual, tol);
+            return -1;
         }
         perf->residuals[i] = res.residual;
         perf->Gamma[i] = res.Gamma;
@@ -938,9 +1199,80 @@ RotorPerformance* qprop(Rotor* rotor, double Uinf, double Omega, double tol, int
     double CQ = perf->Q / (rho * pow(n,2) * pow(rotor->D,5));       //torque coefficient
     perf->CP = 2*PI * CQ;             //power coefficient
     perf->J = Uinf / (n * rotor->D);    //advance ratio
+    return 0;
+}
+
+//run qprop iterations
+RotorPerformance* qprop(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a) {
+    RotorPerformance* perf = alloc_rotor_performance(rotor->nsections - 1);
+    if (!perf) {
+        printf("ERROR: memory allocation error in qprop()\n");
+        return NULL;
+    }
+    if (qprop_into(rotor, Uinf, Omega, tol, itmax, rho, mu, a, perf) != 0) {
+        free_rotor_performance(perf);
+        return NULL;
+    }
     return perf;
 }
 
+//run qprop iterations at multiple operating points, reusing the same output buffers
+//when compiled with OpenMP (-fopenmp), the operating points are distributed across threads
+int qprop_sweep(Rotor* rotor, const double* Uinf, const double* Omega, int npoints,
+                double tol, int itmax, double rho, double mu, double a,
+                double* T, double* Q, double* CT, double* CP, double* J) {
+    //sort the airfoil polars upfront, so that the threads only read the shared rotor data
+    for (int i=1; i<rotor->nsections; ++i) {
+        ensure_sorted_airfoil_polars(&(rotor->sections[i].airfoil));
+    }
+
+    int nfailed = 0;
+    int nallocfailed = 0;
+    #ifdef _OPENMP
+    #pragma omp parallel reduction(+:nfailed,nallocfailed)
+    #endif
+    {
+        //each thread allocates its own output buffers and reuses them for all its points
+        RotorPerformance* perf = alloc_rotor_performance(rotor->nsections - 1);
+        if (!perf) {
+            nallocfailed += 1;
+        }
+        #ifdef _OPENMP
+        #pragma omp for schedule(dynamic)
+        #endif
+        for (int i=0; i<npoints; ++i) {
+            bool converged = perf && (qprop_into(rotor, Uinf[i], Omega[i], tol, itmax, rho, mu, a, perf) == 0);
+            if (!converged) {
+                nfailed += 1;
+            }
+            //outputs are optional: skip the NULL ones
+            if (T) T[i] = converged? perf->T : NAN;
+            if (Q) Q[i] = converged? perf->Q : NAN;
+            if (CT) CT[i] = converged? perf->CT : NAN;
+            if (CP) CP[i] = converged? perf->CP : NAN;
+            if (J) J[i] = converged? perf->J : NAN;
+        }
+        if (perf) {
+            free_rotor_performance(perf);
+        }
+    }
+    if (nallocfailed > 0) {
+        printf("ERROR: memory allocation error in qprop_sweep()\n");
+        return -1;
+    }
+    return nfailed;
+}
+
+//count the elements whose residual exceeds the given tolerance
+int check_residuals(RotorPerformance* perf, double tol) {
+    //branch-free accumulation, so that the compiler can vectorize the comparison
+    int count = 0;
+    for (int i=0; i<perf->nelems; ++i) {
+        count += (fabs(perf->residuals[i]) > tol);
+    }
+    return count;
+}
+
 //free allocated memory on RotorPerformance
 void free_rotor_performance(RotorPerformance* perf) {
     free(perf->residuals);
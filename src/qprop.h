@@ -120,6 +120,15 @@ void free_rotor_performance(RotorPerformance* perf);
 //  - (double): angle in radians
 double deg2rad(double deg);
 
+//DEG2RAD_ARRAY converts an array of angles from degrees to radians
+//Input:
+//  - deg (array of double): angles in degrees
+//  - rad (array of double): output array - same size as deg
+//  - n (int): number of angles in the arrays
+//Output:
+//  - none (the angles in radians are written in rad)
+void deg2rad_array(const double* deg, double* rad, int n);
+
 //READ_XFOIL_POLAR_FROM_FILE reads an airfoil polar from a text file
 //Input:
 //  - filename (array of char): name of the txt file containing the polar data
@@ -155,6 +164,34 @@ Polar* read_xfoil_polar_from_file(const char *filename);
 //    needed, by calling unload_airfoil_from_memory(Airfoil*)
 Airfoil* import_xfoil_polars(const char *filenames[], int number_of_files);
 
+//CREATE_AIRFOIL_FROM_POLARS builds an airfoil from polars that have already been allocated
+//Input:
+//  - polars (array of Polar*): pointers to the polars, e.g. from read_xfoil_polar_from_file
+//  - npolars (int): number of polars in the array
+//Output:
+//  - (Airfoil*): pointer to the airfoil, with polars sorted from lowest to highest Re
+//Notes:
+//  - the airfoil takes ownership of the polars: free them together by calling
+//    free_airfoil(Airfoil*) instead of free_polar(Polar*)
+Airfoil* create_airfoil_from_polars(Polar** polars, int npolars);
+
+//CREATE_AIRFOIL_FROM_ARRAYS builds an airfoil from polars stored back to back in flat arrays
+//Input:
+//  - Re (array of double): Reynolds number of each polar - size npolars
+//  - alpha (array of double): angle of attacks of all polars, one after the other (rad)
+//  - CL (array of double): lift coefficients - same size as alpha
+//  - CD (array of double): drag coefficients - same size as alpha
+//  - sizes (array of int): number of points in each polar - size npolars
+//  - npolars (int): number of polars
+//Output:
+//  - (Airfoil*): pointer to the airfoil, with polars sorted from lowest to highest Re
+//Notes:
+//  - the input arrays are copied, so they can be freed or reused afterwards
+//  - this is the inverse of flattening an airfoil, e.g. to cache it on disk
+//  - It is the caller's responsibility to free the airfoil when it is no longer
+//    needed, by calling free_airfoil(Airfoil*)
+Airfoil* create_airfoil_from_arrays(const double* Re, const double* alpha, const double* CL, const double* CD, const int* sizes, int npolars);
+
 //ANALYTIC_POLAR_CURVES generates polars using the simple analytic model
 //described by Drela in the QPROP user guide
 //Input:
@@ -196,6 +233,38 @@ Rotor* import_rotor_geometry_apc(const char *filename, Airfoil *airfoil);
 //  - the file is assumed to be downloaded from the official APC website
 Rotor* import_rotor_geometry_uiuc(const char *filename, Airfoil* airfoil, double D, int B);
 
+//CREATE_SECTIONS fills an array of blade sections that share the same airfoil
+//Input:
+//  - sections (array of Section): output array, allocated by the caller
+//  - nsections (int): number of sections to fill
+//  - c (array of double): chord lengths in m
+//  - beta (array of double): twist angles in rad - same size as c
+//  - r (array of double): radial distances in m - same size as c
+//  - airfoil (Airfoil*): pointer to the airfoil of all the sections
+//Output:
+//  - none (the sections are written in the given array)
+void create_sections(Section* sections, int nsections, const double* c, const double* beta, const double* r, Airfoil* airfoil);
+
+//CREATE_ROTOR_FROM_ARRAYS creates a propeller geometry from arrays of section properties
+//Input:
+//  - D (double): rotor diameter in m
+//  - B (int): number of blades
+//  - nsections (int): number of sections discretizing a blade
+//  - c (array of double): chord lengths in m, from hub to tip
+//  - beta (array of double): twist angles in rad - same size as c
+//  - r (array of double): radial distances in m - same size as c
+//  - airfoils (array of Airfoil): airfoils used along the blade
+//  - nairfoils (int): number of airfoils in the array
+//  - airfoil_idx (array of int): index of the airfoil used by each section
+//    - same size as c, or NULL to use airfoils[0] everywhere
+//Output:
+//  - (Rotor*): pointer to the new rotor geometry
+//Notes:
+//  - the airfoils are copied by value, so their polars must outlive the rotor
+//  - the rotor can be freed by calling free_rotor(Rotor*)
+Rotor* create_rotor_from_arrays(double D, int B, int nsections, const double* c, const double* beta, const double* r,
+                                Airfoil* airfoils, int nairfoils, const int* airfoil_idx);
+
 //REFINE_ROTOR_SECTIONS creates a propeller geometry with the specified number
 //of equally-spaced sections
 //Input:
@@ -220,5 +289,88 @@ Rotor* refine_rotor_sections(Rotor* oldrotor, int nsections);
 //Notes:
 //  - the current implementation assumes that there is no externally-induced
 //    tangential velocity (Ut = 0)
+//  - the library keeps no global state: independent calls can run in parallel
+//    threads, provided that shared airfoils have their polars sorted by Re,
+//    polars with the same Re included (as returned by import_xfoil_polars
+//    and analytic_polar_curves): sorted airfoils are never written
 RotorPerformance* qprop(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a);
 
+//ALLOC_ROTOR_PERFORMANCE allocates a qprop output that can be reused by qprop_into
+//Input:
+//  - nelems (int): number of elements discretizing a blade (rotor->nsections - 1)
+//Output:
+//  - (RotorPerformance*): pointer to the zero-initialized output (NULL if memory allocation failed)
+//Notes:
+//  - free the output by calling free_rotor_performance(RotorPerformance*)
+RotorPerformance* alloc_rotor_performance(int nelems);
+
+//QPROP_INTO runs qprop and writes the results in a preallocated output
+//Input:
+//  - rotor (Rotor*): pointer to a rotor
+//  - Uinf (double): freestream velocity in m/s
+//  - Omega (double): rotor speed in rad/s
+//  - tol (double): stopping criterion tolerance (suggested value: 1e-6)
+//  - itmax (int): maximum number of iterations (suggested value: 100)
+//  - rho (double): air density in kg/m3 (suggested value: 1.225)
+//  - mu (double): air dynamic viscosity in Pa-s (suggested value: 1.81e-5)
+//  - a (double): speed of sound in m/s (suggested value: 340.0) - set to 0 to disable Mach correction
+//  - perf (RotorPerformance*): output allocated with alloc_rotor_performance(rotor->nsections - 1)
+//Output:
+//  - (int): 0 on success, -1 if the iterations did not converge or perf has the wrong size
+//Notes:
+//  - no memory is allocated, so the same output can be reused across many calls
+int qprop_into(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a, RotorPerformance* perf);
+
+//QPROP_INTO_WARM runs qprop like qprop_into, starting from the solution of a nearby operating point
+//Input:
+//  - rotor, Uinf, Omega, tol, itmax, rho, mu, a, perf: same as qprop_into
+//  - psi (array of double): inflow angle parameter of each element (rad) - size rotor->nsections - 1
+//Output:
+//  - (int): 0 on success, -1 if the iterations did not converge or perf has the wrong size
+//  - psi is overwritten with the converged values
+//Notes:
+//  - the root of each element is searched in a small interval around psi, which is
+//    enlarged until it brackets the root: adjacent operating points need fewer iterations
+//  - elements whose psi is NAN (or outside -pi/2..+pi/2) are solved from scratch,
+//    so fill psi with NAN before the first call
+//  - each element converges to the root nearest the previous solution: this is
+//    usually the root found by qprop_into, but it is not guaranteed when an
+//    element has more than one root (and results never match bit for bit)
+int qprop_into_warm(Rotor* rotor, double Uinf, double Omega, double tol, int itmax, double rho, double mu, double a, RotorPerformance* perf, double* psi);
+
+//QPROP_SWEEP runs qprop at multiple operating points of the same rotor
+//Input:
+//  - rotor (Rotor*): pointer to a rotor
+//  - Uinf (array of double): freestream velocities in m/s
+//  - Omega (array of double): rotor speeds in rad/s - same size as Uinf
+//  - npoints (int): number of operating points
+//  - tol (double): stopping criterion tolerance (suggested value: 1e-6)
+//  - itmax (int): maximum number of iterations (suggested value: 100)
+//  - rho (double): air density in kg/m3 (suggested value: 1.225)
+//  - mu (double): air dynamic viscosity in Pa-s (suggested value: 1.81e-5)
+//  - a (double): speed of sound in m/s (suggested value: 340.0) - set to 0 to disable Mach correction
+//  - T (array of double): preallocated output thrust in N - same size as Uinf
+//  - Q (array of double): preallocated output torque in N-m - same size as Uinf
+//  - CT (array of double): preallocated output thrust coefficient - same size as Uinf
+//  - CP (array of double): preallocated output power coefficient - same size as Uinf
+//  - J (array of double): preallocated output advance ratio - same size as Uinf
+//Output:
+//  - (int): number of operating points that did not converge (-1 if memory allocation failed)
+//Notes:
+//  - the element buffers are allocated once and reused for all the points
+//  - when the library is compiled with OpenMP (-fopenmp), the points are
+//    computed in parallel; set OMP_NUM_THREADS to choose the number of threads
+//  - the prebuilt binaries are single-threaded (see QPROP_OPENMP in build/build.sh)
+//  - any of the outputs can be NULL if it is not needed
+//  - the outputs are set to NAN at the points that did not converge
+int qprop_sweep(Rotor* rotor, const double* Uinf, const double* Omega, int npoints,
+                double tol, int itmax, double rho, double mu, double a,
+                double* T, double* Q, double* CT, double* CP, double* J);
+
+//CHECK_RESIDUALS counts the blade elements that did not converge
+//Input:
+//  - perf (RotorPerformance*): pointer to a qprop output
+//  - tol (double): maximum admissible absolute residual (suggested value: 1e-6)
+//Output:
+//  - (int): number of elements whose absolute residual exceeds tol (0 if converged)
+int check_residuals(RotorPerformance* perf, double tol);
@@ -120,10 +120,65 @@ int main() {
         return 0;
     }
 
+    //test #6: build an airfoil from polars that have already been read
+    Polar* polars6[] = {
+        read_xfoil_polar_from_file("./airfoil_polar_naca4412_Ncrit=6/NACA 4412_T1_Re0.500_M0.00_N6.0.txt"),
+        read_xfoil_polar_from_file("./airfoil_polar_naca4412_Ncrit=6/NACA 4412_T1_Re0.030_M0.00_N6.0.txt")
+    };
+    Airfoil* airfoil6 = create_airfoil_from_polars(polars6, 2);
+    if (airfoil6->size == 2
+                && airfoil6->polars[0]->Re == 30000
+                && airfoil6->polars[1]->Re == 500000
+                && airfoil6->polars[0]->size == airfoil5->polars[0]->size
+                && airfoil6->polars[1]->CL[airfoil6->polars[1]->size-1] == airfoil5->polars[3]->CL[airfoil5->polars[3]->size-1]) {
+        printf("TEST 2.6 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 2.6 - FAILED :(\n");
+        free_polar(polar1);
+        free_polar(polar2);
+        free_airfoil(airfoil3);
+        free_airfoil(airfoil4);
+        free_airfoil(airfoil5);
+        free_airfoil(airfoil6);
+        return 0;
+    }
+
+    //test #7: build an airfoil from polars stored in flat arrays
+    const double Re7[] = {200000.0, 50000.0};
+    const double alpha7[] = {-0.1, 0.0, 0.1, -0.2, 0.2};
+    const double CL7[] = {-0.4, 0.2, 0.8, -0.6, 1.0};
+    const double CD7[] = {0.02, 0.01, 0.02, 0.05, 0.06};
+    const int sizes7[] = {3, 2};
+    Airfoil* airfoil7 = create_airfoil_from_arrays(Re7, alpha7, CL7, CD7, sizes7, 2);
+    if (airfoil7->size == 2
+                && airfoil7->polars[0]->Re == 50000
+                && airfoil7->polars[0]->size == 2
+                && airfoil7->polars[0]->alpha[1] == 0.2
+                && airfoil7->polars[0]->CD[0] == 0.05
+                && airfoil7->polars[1]->Re == 200000
+                && airfoil7->polars[1]->size == 3
+                && airfoil7->polars[1]->CL[2] == 0.8) {
+        printf("TEST 2.7 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 2.7 - FAILED :(\n");
+        free_polar(polar1);
+        free_polar(polar2);
+        free_airfoil(airfoil3);
+        free_airfoil(airfoil4);
+        free_airfoil(airfoil5);
+        free_airfoil(airfoil6);
+        free_airfoil(airfoil7);
+        return 0;
+    }
+
     free_polar(polar1);
     free_polar(polar2);
     free_airfoil(airfoil3);
     free_airfoil(airfoil4);
     free_airfoil(airfoil5);
+    free_airfoil(airfoil6);
+    free_airfoil(airfoil7);
     return 0;
 }
@@ -103,9 +103,97 @@ int main() {
     Uinf = 19.09445 m/s  -  Thrust = 1.1348963862887862 N  -  Torque = 0.05252953779296362 N-m
     */
 
+    //test #3: convergence check on the residuals
+    if (check_residuals(perf1, tol) == 0
+            && check_residuals(perf2, tol) == 0
+            && check_residuals(perf1, -1.0) == perf1->nelems) {
+        printf("TEST 5.3 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 5.3 - FAILED :(\n");
+        free_rotor(apc10x7sf);
+        free_airfoil(naca4412);
+        free_rotor_performance(perf1);
+        free_rotor_performance(perf2);
+        return 0;
+    }
+
+    //test #4: sweep over both operating points in a single call
+    double Uinf_sweep[2] = {1.2729633333333334, 19.09445};
+    double Omega_sweep[2] = {Omega, Omega};
+    double T_sweep[2];
+    double Q_sweep[2];
+    double J_sweep[2];
+    int nfailed = qprop_sweep(apc10x7sf, Uinf_sweep, Omega_sweep, 2, tol, itmax, rho, mu, a, T_sweep, Q_sweep, NULL, NULL, J_sweep);
+    if (nfailed == 0
+            && T_sweep[0] == perf1->T && Q_sweep[0] == perf1->Q && J_sweep[0] == perf1->J
+            && T_sweep[1] == perf2->T && Q_sweep[1] == perf2->Q && J_sweep[1] == perf2->J) {
+        printf("TEST 5.4 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 5.4 - FAILED :(\n");
+        free_rotor(apc10x7sf);
+        free_airfoil(naca4412);
+        free_rotor_performance(perf1);
+        free_rotor_performance(perf2);
+        return 0;
+    }
+
+    //test #5: reuse a preallocated output across operating points
+    RotorPerformance* perf5 = alloc_rotor_performance(apc10x7sf->nsections - 1);
+    int status5a = qprop_into(apc10x7sf, 19.09445, Omega, tol, itmax, rho, mu, a, perf5);
+    int status5b = qprop_into(apc10x7sf, 1.2729633333333334, Omega, tol, itmax, rho, mu, a, perf5);
+    if (status5a == 0 && status5b == 0
+            && perf5->T == perf1->T && perf5->Q == perf1->Q
+            && perf5->dTdr[perf5->nelems-1] == perf1->dTdr[perf1->nelems-1]) {
+        printf("TEST 5.5 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 5.5 - FAILED :(\n");
+        free_rotor(apc10x7sf);
+        free_airfoil(naca4412);
+        free_rotor_performance(perf1);
+        free_rotor_performance(perf2);
+        free_rotor_performance(perf5);
+        return 0;
+    }
+
+    //test #6: warm start from the solution of a nearby operating point
+    int nelems6 = apc10x7sf->nsections - 1;
+    double* psi6 = calloc(nelems6, sizeof(double));
+    for (int i=0; i<nelems6; ++i) {
+        psi6[i] = NAN;
+    }
+    RotorPerformance* perf6 = alloc_rotor_performance(nelems6);
+    int status6a = qprop_into_warm(apc10x7sf, 1.2729633333333334, Omega, tol, itmax, rho, mu, a, perf6, psi6);
+    bool cold6 = (perf6->T == perf1->T && perf6->Q == perf1->Q);        //NAN guesses solve from scratch
+    int status6b = qprop_into_warm(apc10x7sf, 1.3, Omega, tol, itmax, rho, mu, a, perf6, psi6);
+    int status6c = qprop_into_warm(apc10x7sf, 1.2729633333333334, Omega, tol, itmax, rho, mu, a, perf6, psi6);
+    if (status6a == 0 && status6b == 0 && status6c == 0 && cold6
+            && check_residuals(perf6, tol) == 0
+            && fabs(perf6->T - perf1->T) <= 1e-4*fabs(perf1->T)
+            && fabs(perf6->Q - perf1->Q) <= 1e-4*fabs(perf1->Q)
+            && fabs(psi6[0]) < M_PI/2) {
+        printf("TEST 5.6 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 5.6 - FAILED :(\n");
+        free_rotor(apc10x7sf);
+        free_airfoil(naca4412);
+        free_rotor_performance(perf1);
+        free_rotor_performance(perf2);
+        free_rotor_performance(perf5);
+        free_rotor_performance(perf6);
+        free(psi6);
+        return 0;
+    }
+
     free_rotor(apc10x7sf);
     free_airfoil(naca4412);
     free_rotor_performance(perf1);
     free_rotor_performance(perf2);
+    free_rotor_performance(perf5);
+    free_rotor_performance(perf6);
+    free(psi6);
     return 0;
 }
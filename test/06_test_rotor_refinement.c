@@ -121,12 +121,56 @@ int main() {
         return 0;
     }
 
+    //test #5: rebuild the UIUC blade from arrays, alternating two copies of the same airfoil
+    int n5 = apc10x7sf->nsections;
+    double* c5 = calloc(n5, sizeof(double));
+    double* beta5 = calloc(n5, sizeof(double));
+    double* r5 = calloc(n5, sizeof(double));
+    int* airfoil_idx5 = calloc(n5, sizeof(int));
+    for (int i=0; i<n5; ++i) {
+        c5[i] = apc10x7sf->sections[i].c;
+        beta5[i] = apc10x7sf->sections[i].beta;
+        r5[i] = apc10x7sf->sections[i].r;
+        airfoil_idx5[i] = i%2;
+    }
+    Airfoil airfoils5[2] = {*naca4412, *naca4412};
+    Rotor* rotor5 = create_rotor_from_arrays(apc10x7sf->D, apc10x7sf->B, n5, c5, beta5, r5, airfoils5, 2, airfoil_idx5);
+    airfoil_idx5[n5-1] = 2;     //out of range
+    Rotor* rotor5_invalid = create_rotor_from_arrays(apc10x7sf->D, apc10x7sf->B, n5, c5, beta5, r5, airfoils5, 2, airfoil_idx5);
+    RotorPerformance* perf5 = qprop(rotor5, Uinf, Omega, tol, itmax, rho, mu, a);
+    free(c5);
+    free(beta5);
+    free(r5);
+    free(airfoil_idx5);
+    if (rotor5->nsections == n5
+            && rotor5->sections[n5-1].airfoil.polars == naca4412->polars
+            && !rotor5_invalid
+            && fabs(perf5->T - perf1->T) <= 1e-12
+            && fabs(perf5->Q - perf1->Q) <= 1e-12) {
+        printf("TEST 6.5 - PASSED :)\n");
+    }
+    else {
+        printf("TEST 6.5 - FAILED :(\n");
+        free_rotor(apc10x7sf);
+        free_rotor(rotor2);
+        free_rotor(rotor3);
+        free_rotor(rotor5);
+        free_airfoil(naca4412);
+        free_rotor_performance(perf1);
+        free_rotor_performance(perf2);
+        free_rotor_performance(perf3);
+        free_rotor_performance(perf5);
+        return 0;
+    }
+
     free_rotor(apc10x7sf);
     free_rotor(rotor2);
     free_rotor(rotor3);
+    free_rotor(rotor5);
     free_airfoil(naca4412);
     free_rotor_performance(perf1);
     free_rotor_performance(perf2);
     free_rotor_performance(perf3);
+    free_rotor_performance(perf5);
     return 0;
 }
@@ -13,7 +13,12 @@ import .QProp;
 function main()
     #test 1 - simple utilities
     myangle = QProp.deg2rad(+45.0);
-    if abs(myangle - 0.7853981633974483) <= 1e-6
+    myangles = QProp.deg2rad([-90.0, +45.0, +180.0]);
+    if (abs(myangle - 0.7853981633974483) <= 1e-6
+            && length(myangles) == 3
+            && abs(myangles[1] + 1.5707963267948966) <= 1e-6
+            && abs(myangles[2] - myangle) <= 1e-12
+            && abs(myangles[3] - 3.141592653589793) <= 1e-6)
         println("TEST J1 - PASSED :)");
     else
         println("TEST J1 - FAILED :(");
@@ -92,6 +97,19 @@ function main()
         println("TEST J6 - FAILED :(");
         return;
     end
+
+    #test 7 - sweep multiple operating points in a single call
+    T7, Q7, CT7, CP7, J7 = QProp.qprop_sweep(apc10x7sf_refined, [Uinf, 2*Uinf], [Omega, Omega]);
+    if (length(T7) == 2
+                && T7[1] == result6.T
+                && Q7[1] == result6.Q
+                && J7[1] == result6.J
+                && T7[2] < T7[1])
+        println("TEST J7 - PASSED :)");
+    else
+        println("TEST J7 - FAILED :(");
+        return;
+    end
 end
 
 main();
@@ -7,6 +7,7 @@
 #   Author: Andrea Pavan
 #   License: MIT
 #-------------------------------------------------------------------------------
+import ctypes
 import os
 import sys
 sys.path.insert(0, "../src/bindings/")
@@ -15,7 +16,12 @@ import qprop
 def main():
     #test 1 - simple utilities
     myangle = qprop.deg2rad(+45.0)
-    if abs(myangle - 0.7853981633974483) <= 1e-6:
+    myangles = qprop.deg2rad([-90.0, +45.0, +180.0])
+    if abs(myangle - 0.7853981633974483) <= 1e-6 \
+                and len(myangles) == 3 \
+                and abs(myangles[0] + 1.5707963267948966) <= 1e-6 \
+                and abs(myangles[1] - myangle) <= 1e-12 \
+                and abs(myangles[2] - 3.141592653589793) <= 1e-6:
         print("TEST P1 - PASSED :)")
     else:
         print("TEST P1 - FAILED :(")
@@ -93,7 +99,9 @@ def main():
     result6 = qprop.qprop(apc10x7sf_refined, Uinf, Omega)
     if abs(result6.J - 0.05) <= 1e-6 \
                 and abs(result6.T - 7.8) <= 0.1 \
-                and abs(result6.Q - 0.14) <= 0.01:
+                and abs(result6.Q - 0.14) <= 0.01 \
+                and qprop.check_residuals(result6, 1e-6) == 0 \
+                and qprop.check_residuals(result6, -1.0) == result6.nelems:
         print("TEST P6 - PASSED :)")
     else:
         print("TEST P6 - FAILED :(")
@@ -105,13 +113,336 @@ def main():
         qprop.free_rotor_performance(result6)
         return
 
+    #test 7 - build the same rotor from Python lists and compare the results
+    polars7 = []
+    for i in range(naca4412.size):
+        polari = naca4412.polars[i].contents
+        polars7.append(qprop.create_polar(
+            polari.Re,
+            polari.alpha[:polari.size],
+            polari.CL[:polari.size],
+            polari.CD[:polari.size],
+            polari.size
+        ))
+    naca4412_7 = qprop.create_airfoil(polars7, len(polars7))
+    sections7 = [
+        qprop.create_section(s.c, s.beta, s.r, naca4412_7) \
+        for s in apc10x7sf_refined.sections[:apc10x7sf_refined.nsections]
+    ]
+    rotor7 = qprop.create_rotor(apc10x7sf_refined.D, apc10x7sf_refined.B, len(sections7), sections7)
+    result7 = qprop.qprop(rotor7, Uinf, Omega)
+    if abs(result7.T - result6.T) <= 1e-9 and abs(result7.Q - result6.Q) <= 1e-9:
+        print("TEST P7 - PASSED :)")
+    else:
+        print("TEST P7 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        return
+
+    #test 8 - build the same rotor from arrays, using both airfoils along the blade
+    nsections8 = apc10x7sf_refined.nsections
+    sections8 = apc10x7sf_refined.sections[:nsections8]
+    rotor8 = qprop.create_rotor_from_arrays(
+        apc10x7sf_refined.D,
+        apc10x7sf_refined.B,
+        [s.c for s in sections8],
+        [s.beta for s in sections8],
+        [s.r for s in sections8],
+        [naca4412, naca4412_7],
+        [i % 2 for i in range(nsections8)]
+    )
+    result8 = qprop.qprop(rotor8, Uinf, Omega)
+    if rotor8.nsections == nsections8 \
+                and abs(rotor8.sections[nsections8-1].beta - sections8[-1].beta) <= 1e-12 \
+                and abs(result8.T - result6.T) <= 1e-9 \
+                and abs(result8.Q - result6.Q) <= 1e-9:
+        print("TEST P8 - PASSED :)")
+    else:
+        print("TEST P8 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        return
+
+    #test 9 - build the same rotor with a single call to create_sections
+    sections9 = qprop.create_sections(
+        [s.c for s in sections8],
+        [s.beta for s in sections8],
+        [s.r for s in sections8],
+        naca4412_7
+    )
+    rotor9 = qprop.create_rotor(apc10x7sf_refined.D, apc10x7sf_refined.B, len(sections9), sections9)
+    result9 = qprop.qprop(rotor9, Uinf, Omega)
+    if len(sections9) == nsections8 \
+                and abs(sections9[nsections8-1].r - sections8[-1].r) <= 1e-12 \
+                and abs(result9.T - result6.T) <= 1e-9 \
+                and abs(result9.Q - result6.Q) <= 1e-9:
+        print("TEST P9 - PASSED :)")
+    else:
+        print("TEST P9 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        return
+
+    #test 10 - zero-copy NumPy views of the qprop outputs
+    if qprop.np is None:
+        print("TEST P10 - SKIPPED (numpy not installed)")
+    elif result6.dTdr_np.shape == (result6.nelems,) \
+                and result6.dTdr_np[-1] == result6.dTdr[result6.nelems-1] \
+                and result6.as_numpy("r")[0] == result6.r[0] \
+                and abs(result6.residuals_np).max() <= 1e-6 \
+                and result6.dTdr_np is result6.dTdr_np \
+                and result6.as_arrays()["dQdr"] is result6.dQdr_np \
+                and result6.as_structured()["T"][0] == result6.T \
+                and result6.as_structured()["nelems"][0] == result6.nelems:
+        print("TEST P10 - PASSED :)")
+    else:
+        print("TEST P10 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        return
+
+    #test 11 - sweep multiple operating points in a single call
+    T11, Q11, CT11, CP11, J11 = qprop.qprop_sweep(apc10x7sf_refined, [Uinf, 2*Uinf], Omega)
+    if len(T11) == 2 \
+                and T11[0] == result6.T and Q11[0] == result6.Q \
+                and CT11[0] == result6.CT and CP11[0] == result6.CP and J11[0] == result6.J \
+                and T11[1] < T11[0]:
+        print("TEST P11 - PASSED :)")
+    else:
+        print("TEST P11 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        return
+
+    #test 12 - analytic polars are cached across identical calls
+    airfoil12a = qprop.analytic_polar_curves(0.50, 5.8, -0.3, 1.2, 0.028, 0.050, 0.020, 0.5, 70000, -0.7)
+    airfoil12b = qprop.analytic_polar_curves(0.50, 5.8, -0.3, 1.2, 0.028, 0.050, 0.020, 0.5, 70000, -0.7)
+    airfoil12c = qprop.analytic_polar_curves(0.50, 5.8, -0.3, 1.2, 0.028, 0.050, 0.020, 0.5, 100000, -0.7)
+    ncached12 = len(qprop._analytic_polar_cache)
+    qprop.free_airfoil(airfoil12c)
+    qprop.free_airfoil(airfoil12a)          #the shared airfoil is still held by airfoil12b
+    if ctypes.addressof(airfoil12a) == ctypes.addressof(airfoil12b) \
+                and ctypes.addressof(airfoil12a) != ctypes.addressof(airfoil12c) \
+                and ncached12 == 2 \
+                and len(qprop._analytic_polar_cache) == 1 \
+                and airfoil12b.polars[0].contents.Re > 0:
+        qprop.free_airfoil(airfoil12b)
+        print("TEST P12 - PASSED :)")
+    else:
+        print("TEST P12 - FAILED :(")
+        qprop.clear_polar_cache()
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        return
+
+    #test 13 - failures in the C library raise an exception instead of returning a NULL pointer
+    try:
+        qprop.import_rotor_geometry_apc("nonexistent_file.PE0", naca4412)
+        raised13 = False
+    except RuntimeError:
+        raised13 = True
+    if raised13:
+        print("TEST P13 - PASSED :)")
+    else:
+        print("TEST P13 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        return
+
+    #test 14 - reuse a preallocated output across qprop calls
+    with qprop.alloc_rotor_performance(apc10x7sf_refined.nsections - 1) as result14:
+        qprop.qprop(apc10x7sf_refined, 2*Uinf, Omega, out=result14)
+        qprop.qprop(apc10x7sf_refined, Uinf, Omega, out=result14)
+        passed14 = result14.T == result6.T \
+                and result14.Q == result6.Q \
+                and result14.dTdr[result14.nelems-1] == result6.dTdr[result6.nelems-1]
+    if passed14:
+        print("TEST P14 - PASSED :)")
+    else:
+        print("TEST P14 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        return
+
+    #test 15 - NumPy arrays are passed to the C library without conversion to lists
+    if qprop.np is None:
+        print("TEST P15 - SKIPPED (numpy not installed)")
+    else:
+        alpha15 = qprop.np.array(polar2.alpha[:polar2.size])
+        polar15 = qprop.create_polar(polar2.Re, alpha15, qprop.np.array(polar2.CL[:polar2.size]), qprop.np.array(polar2.CD[:polar2.size]), polar2.size)
+        T15, Q15, _, _, _ = qprop.qprop_sweep(apc10x7sf_refined, qprop.np.array([Uinf, 2*Uinf]), Omega)
+        if ctypes.addressof(polar15.alpha.contents) == alpha15.ctypes.data \
+                    and polar15.CD[polar15.size-1] == polar2.CD[polar2.size-1] \
+                    and isinstance(T15, qprop.np.ndarray) and list(T15) == T11 and list(Q15) == Q11 \
+                    and qprop.deg2rad(qprop.np.array([45.0]))[0] == qprop.deg2rad(45.0):
+            print("TEST P15 - PASSED :)")
+        else:
+            print("TEST P15 - FAILED :(")
+            qprop.free_polar(polar2)
+            qprop.free_airfoil(naca4412)
+            qprop.free_rotor(apc10x7sf)
+            qprop.free_rotor(apc10x7sf_refined)
+            qprop.free_rotor(apc10x7sf_uiuc)
+            qprop.free_rotor(rotor8)
+            qprop.free_rotor_performance(result6)
+            qprop.free_rotor_performance(result7)
+            qprop.free_rotor_performance(result8)
+            qprop.free_rotor_performance(result9)
+            return
+
+    #test 16 - analyze multiple rotors in parallel threads
+    result16 = qprop.qprop_many([apc10x7sf_refined, rotor9], [Uinf, 2*Uinf], Omega)
+    if len(result16) == 2 \
+                and result16[0].T == result6.T and result16[0].Q == result6.Q \
+                and result16[1].T == T11[1] and result16[1].Q == Q11[1]:
+        print("TEST P16 - PASSED :)")
+        for perf in result16:
+            qprop.free_rotor_performance(perf)
+    else:
+        print("TEST P16 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        for perf in result16:
+            qprop.free_rotor_performance(perf)
+        return
+
+    #test 17 - build an airfoil from polars stored back to back in flat arrays
+    polars17 = [naca4412.polars[i].contents for i in range(naca4412.size)]
+    naca4412_17 = qprop.create_airfoil_from_arrays(
+        [polar.Re for polar in reversed(polars17)],
+        [x for polar in reversed(polars17) for x in polar.alpha[:polar.size]],
+        [x for polar in reversed(polars17) for x in polar.CL[:polar.size]],
+        [x for polar in reversed(polars17) for x in polar.CD[:polar.size]],
+        [polar.size for polar in reversed(polars17)]
+    )
+    copies17 = [(naca4412_17.polars[i].contents, polars17[i]) for i in range(naca4412.size)]
+    if naca4412_17.size == naca4412.size \
+                and all(copy.Re == polar.Re and copy.size == polar.size for copy, polar in copies17) \
+                and all(copy.CD[j] == polar.CD[j] for copy, polar in copies17 for j in range(polar.size)):
+        print("TEST P17 - PASSED :)")
+        qprop.free_airfoil(naca4412_17)
+    else:
+        print("TEST P17 - FAILED :(")
+        qprop.free_polar(polar2)
+        qprop.free_airfoil(naca4412)
+        qprop.free_rotor(apc10x7sf)
+        qprop.free_rotor(apc10x7sf_refined)
+        qprop.free_rotor(apc10x7sf_uiuc)
+        qprop.free_rotor(rotor8)
+        qprop.free_rotor_performance(result6)
+        qprop.free_rotor_performance(result7)
+        qprop.free_rotor_performance(result8)
+        qprop.free_rotor_performance(result9)
+        qprop.free_airfoil(naca4412_17)
+        return
+
+    #test 18 - warm start the iterations from a nearby operating point
+    if qprop.np is None:
+        print("TEST P18 - SKIPPED (numpy not installed)")
+    else:
+        psi18 = qprop.np.full(apc10x7sf_refined.nsections - 1, qprop.np.nan)
+        with qprop.alloc_rotor_performance(apc10x7sf_refined.nsections - 1) as result18:
+            qprop.qprop(apc10x7sf_refined, 1.1*Uinf, Omega, out=result18, psi=psi18)
+            qprop.qprop(apc10x7sf_refined, Uinf, Omega, out=result18, psi=psi18)
+            passed18 = not qprop.np.isnan(psi18).any() \
+                        and qprop.check_residuals(result18, 1e-6) == 0 \
+                        and abs(result18.T - result6.T) <= 1e-4*abs(result6.T) \
+                        and abs(result18.Q - result6.Q) <= 1e-4*abs(result6.Q)
+        if passed18:
+            print("TEST P18 - PASSED :)")
+        else:
+            print("TEST P18 - FAILED :(")
+            qprop.free_polar(polar2)
+            qprop.free_airfoil(naca4412)
+            qprop.free_rotor(apc10x7sf)
+            qprop.free_rotor(apc10x7sf_refined)
+            qprop.free_rotor(apc10x7sf_uiuc)
+            qprop.free_rotor(rotor8)
+            qprop.free_rotor_performance(result6)
+            qprop.free_rotor_performance(result7)
+            qprop.free_rotor_performance(result8)
+            qprop.free_rotor_performance(result9)
+            return
+
     #completed
     qprop.free_polar(polar2)
     qprop.free_airfoil(naca4412)
     qprop.free_rotor(apc10x7sf)
     qprop.free_rotor(apc10x7sf_refined)
     qprop.free_rotor(apc10x7sf_uiuc)
+    qprop.free_rotor(rotor8)
     qprop.free_rotor_performance(result6)
+    qprop.free_rotor_performance(result7)
+    qprop.free_rotor_performance(result8)
+    qprop.free_rotor_performance(result9)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,26 @@
+#-------------------------------------------------------------------------------
+#   Shared headless mode of the Python validation scripts
+#
+#   How to use (from a script in a subfolder of validation/):
+#   sys.path.insert(0, "../");
+#   from _headless import show_figure;
+#
+#   Set QPROP_HEADLESS=1 to save the figures as PNG files in QPROP_OUTPUT_DIR
+#   (default: "output" in the working directory, ignored by git) instead of
+#   showing them in a window
+#-------------------------------------------------------------------------------
+import matplotlib.pyplot as plt;
+import os;
+
+HEADLESS = bool(os.environ.get("QPROP_HEADLESS"))
+OUTPUT_DIR = os.environ.get("QPROP_OUTPUT_DIR", "output")
+if HEADLESS:
+    plt.switch_backend("Agg")
+
+def show_figure(fig, filename):
+    if HEADLESS:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        fig.savefig(os.path.join(OUTPUT_DIR, filename), dpi=100)
+        plt.close(fig)
+    else:
+        plt.show()
@@ -25,17 +25,24 @@
 #   Author: Andrea Pavan
 #   License: MIT
 #-------------------------------------------------------------------------------
+import math;
 import matplotlib.pyplot as plt;
+import numpy as np;
 import os;
 import sys;
 sys.path.insert(0, "./qprop/");
 import qprop;
+sys.path.insert(0, "../");
+from _headless import show_figure;      #see validation/_headless.py
+
+RAD_PER_RPM = math.pi/30                #rpm to rad/s
+RPM_PER_RAD = 30/math.pi                #rad/s to rpm
 
 def main():
     #read airfoil polars from files
     polar_filenames = [
         os.path.join("airfoil_polar_clarky_Ncrit=7", f) \
-        for f in os.listdir("airfoil_polar_clarky_Ncrit=7") \
+        for f in sorted(os.listdir("airfoil_polar_clarky_Ncrit=7")) \
         if f.endswith(".txt")
     ]
     clarky = qprop.import_xfoil_polars(polar_filenames)
@@ -44,44 +51,31 @@ def main():
     apc42x4 = qprop.import_rotor_geometry_apc("42x4-PERF.PE0", clarky)
 
     #calculate propeller performance using qprop.c
-    Uinf = [0.5+0.5*i for i in range(35)]       #vector containing freestream velocities (m/s) - 0.5:0.5:10.5
-    Omega = 10042*3.14159265359/30              #rotor speed (rad/s)
-    CT = [0] * len(Uinf)                        #vector containing thrust coefficients
-    CP = [0] * len(Uinf)                        #vector containing power coefficients
-    eta = [0] * len(Uinf)                       #vector containing propeller efficiencies
-    J = [0] * len(Uinf)                         #vector containing advance ratios
-    for i in range(len(Uinf)):
-        #run analysis
-        qprop_results = qprop.qprop(apc42x4, Uinf[i], Omega, 1e-8, 200, 1.225, 1.81e-5, 340.0)
-        CT[i] = qprop_results.CT
-        CP[i] = qprop_results.CP
-        J[i] = qprop_results.J
-        eta[i] = J[i] * CT[i] / CP[i]
+    Uinf = 0.5 + 0.5*np.arange(35)              #vector containing freestream velocities (m/s) - 0.5:0.5:17.5
+    Omega = 10042*RAD_PER_RPM                   #rotor speed (rad/s)
+    #run the whole sweep in a single call
+    _, _, CT, CP, J = qprop.qprop_sweep(apc42x4, Uinf, Omega, 1e-8, 200, 1.225, 1.81e-5, 340.0)
+    eta = J * CT / CP                           #vector containing propeller efficiencies
 
     #read UIUC experimental data by concatenating two files
-    uiuc_data = []
-    with open(os.path.join("uiuc_data","apcff_4.2x4_0620rd_10042.txt"), "r") as fileio:
-        next(fileio)                #skip header
-        for line in fileio:
-            uiuc_data.append([float(x) for x in line.split()])
-    with open(os.path.join("uiuc_data","apcff_4.2x4_0621rd_10071.txt"), "r") as fileio:
-        next(fileio)                #skip header
-        for line in fileio:
-            uiuc_data.append([float(x) for x in line.split()])
-    uiuc_data = uiuc_data[:-3]      #skip points with negative thrust
-    #the variable uiuc_data is a List of List:
+    uiuc_data = np.vstack([
+        np.loadtxt(os.path.join("uiuc_data", f), skiprows=1)       #skip header
+        for f in ["apcff_4.2x4_0620rd_10042.txt", "apcff_4.2x4_0621rd_10071.txt"]
+    ])[:-3]                         #skip points with negative thrust
+    #the variable uiuc_data is a 2D array with one row per test point:
     #   [ [0.113578  0.128215  0.112438  0.129516],
     #     [0.170594  0.126315  0.112042  0.192328],
     #     ⋮
     #     [0.962425  0.011545  0.035425  0.313629] ]
     #     (J)       (CT)       (CP)     (eta)
+    J_uiuc, CT_uiuc, CP_uiuc, eta_uiuc = uiuc_data.T           #column views, shared by the three plots
 
     #plot J-CT
     #replicating https://m-selig.ae.illinois.edu/props/volume-2/plots/apcff_4.2x4_ct.png
     plt1 = plt.figure(figsize=(6,4), dpi=100)
     plt.plot(J, CT, label="qprop.c", linewidth=2)
-    plt.scatter([row[0] for row in uiuc_data], [row[1] for row in uiuc_data], label="UIUC WT", marker="D", s=20, color="darkorange")
-    plt.title("APC 4.2x4 Thrust ({} rpm)".format(int(Omega*30/3.14159265359)))
+    plt.scatter(J_uiuc, CT_uiuc, label="UIUC WT", marker="D", s=20, color="darkorange")
+    plt.title("APC 4.2x4 Thrust ({} rpm)".format(round(Omega*RPM_PER_RAD)))
     plt.legend(loc="upper right")
     plt.xlabel("Advance ratio J")
     plt.ylabel("Thrust coefficient CT")
@@ -91,14 +85,14 @@ def main():
     plt.grid(True, which="both")
     plt.xticks([0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2])
     plt.yticks([0.00, 0.05, 0.10, 0.15])
-    plt.show()
+    show_figure(plt1, "results_performance_thrust.png")
 
     #plot J-CP
     #replicating https://m-selig.ae.illinois.edu/props/volume-2/plots/apcff_4.2x4_cp.png
     plt1 = plt.figure(figsize=(6,4), dpi=100)
     plt.plot(J, CP, label="qprop.c", linewidth=2)
-    plt.scatter([row[0] for row in uiuc_data], [row[2] for row in uiuc_data], label="UIUC WT", marker="D", s=20, color="darkorange")
-    plt.title("APC 4.2x4 Power ({} rpm)".format(int(Omega*30/3.14159265359)))
+    plt.scatter(J_uiuc, CP_uiuc, label="UIUC WT", marker="D", s=20, color="darkorange")
+    plt.title("APC 4.2x4 Power ({} rpm)".format(round(Omega*RPM_PER_RAD)))
     plt.legend(loc="upper right")
     plt.xlabel("Advance ratio J")
     plt.ylabel("Power coefficient CP")
@@ -108,14 +102,14 @@ def main():
     plt.grid(True, which="both")
     plt.xticks([0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2])
     plt.yticks([0.00, 0.05, 0.10, 0.15])
-    plt.show()
+    show_figure(plt1, "results_performance_power.png")
 
     #plot J-eta
     #replicating https://m-selig.ae.illinois.edu/props/volume-2/plots/apcff_4.2x4_eta.png
     plt1 = plt.figure(figsize=(6,4), dpi=100)
     plt.plot(J, eta, label="qprop.c", linewidth=2)
-    plt.scatter([row[0] for row in uiuc_data], [row[3] for row in uiuc_data], label="UIUC WT", marker="D", s=20, color="darkorange")
-    plt.title("APC 4.2x4 Efficiency ({} rpm)".format(int(Omega*30/3.14159265359)))
+    plt.scatter(J_uiuc, eta_uiuc, label="UIUC WT", marker="D", s=20, color="darkorange")
+    plt.title("APC 4.2x4 Efficiency ({} rpm)".format(round(Omega*RPM_PER_RAD)))
     plt.legend(loc="upper right")
     plt.xlabel("Advance ratio J")
     plt.ylabel("Efficiency η")
@@ -125,7 +119,7 @@ def main():
     plt.grid(True, which="both")
     plt.xticks([0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2])
     plt.yticks([0.0, 0.2, 0.4, 0.6, 0.8])
-    plt.show()
+    show_figure(plt1, "results_performance_efficiency.png")
 
 if __name__ == "__main__":
     main();
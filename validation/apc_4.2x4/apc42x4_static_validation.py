@@ -24,17 +24,24 @@
 #   Author: Andrea Pavan
 #   License: MIT
 #-------------------------------------------------------------------------------
+import math;
 import matplotlib.pyplot as plt;
+import numpy as np;
 import os;
 import sys;
 sys.path.insert(0, "./qprop/");
 import qprop;
+sys.path.insert(0, "../");
+from _headless import show_figure;      #see validation/_headless.py
+
+RAD_PER_RPM = math.pi/30                #rpm to rad/s
+RPM_PER_RAD = 30/math.pi                #rad/s to rpm
 
 def main():
     #read airfoil polars from files
     polar_filenames = [
         os.path.join("airfoil_polar_clarky_Ncrit=7", f) \
-        for f in os.listdir("airfoil_polar_clarky_Ncrit=7") \
+        for f in sorted(os.listdir("airfoil_polar_clarky_Ncrit=7")) \
         if f.endswith(".txt")
     ]
     clarky = qprop.import_xfoil_polars(polar_filenames)
@@ -44,33 +51,25 @@ def main():
 
     #calculate propeller performance using qprop.c
     Uinf = 0.01                                                     #freestream velocity (m/s)
-    Omega = [i*3.14159265359/30 for i in range(1490, 9881, 500)]    #vector containing rotor speeds (rad/s)
-    CT0 = [0] * len(Omega)                                          #vector containing static thrust coefficients
-    CP0 = [0] * len(Omega)                                          #vector containing static power coefficients
-    for i in range(len(Omega)):
-        #run analysis
-        qprop_results = qprop.qprop(apc42x4, Uinf, Omega[i], 1e-8, 200, 1.225, 1.81e-5, 340.0)
-        CT0[i] = qprop_results.CT
-        CP0[i] = qprop_results.CP
+    Omega = np.arange(1490, 9881, 500)*RAD_PER_RPM                  #vector containing rotor speeds (rad/s)
+    #run the whole sweep in a single call, returning static thrust and power coefficients
+    _, _, CT0, CP0, _ = qprop.qprop_sweep(apc42x4, Uinf, Omega, 1e-8, 200, 1.225, 1.81e-5, 340.0)
 
     #read UIUC experimental data from file
-    uiuc_data = []
-    with open(os.path.join("uiuc_data","apcff_4.2x4_static_0615rd.txt"), "r") as fileio:
-        next(fileio)        #skip header
-        for line in fileio:
-            uiuc_data.append([float(x) for x in line.split()])
-    #the variable uiuc_data is a List of List:
+    uiuc_data = np.loadtxt(os.path.join("uiuc_data","apcff_4.2x4_static_0615rd.txt"), skiprows=1)     #skip header
+    #the variable uiuc_data is a 2D array with one row per test point:
     #   [ [1490.0, 0.125114, 0.13544],
     #   [2033.333, 0.121907, 0.126335],
     #   ⋮
     #   [9880.0, 0.129241, 0.106961] ]
     #   (rpm)    (CT0)     (CP0)
+    rpm_uiuc, CT0_uiuc, CP0_uiuc = uiuc_data.T                      #column views, shared by the two plots
 
     #plot RPM-CT
     #replicating https://m-selig.ae.illinois.edu/props/volume-2/plots/apcff_4.2x4_static_ctcp.png
     plt1 = plt.figure(figsize=(6,4), dpi=100)
-    plt.plot([i*30/3.14159265359 for i in Omega], CT0, label="qprop.c", linewidth=2)
-    plt.scatter([row[0] for row in uiuc_data], [row[1] for row in uiuc_data], label="UIUC WT", marker="D", s=20, color="darkorange")
+    plt.plot(Omega*RPM_PER_RAD, CT0, label="qprop.c", linewidth=2)
+    plt.scatter(rpm_uiuc, CT0_uiuc, label="UIUC WT", marker="D", s=20, color="darkorange")
     plt.title("APC 4.2x4 Thrust (Hovering)")
     plt.legend(loc="lower right")
     plt.xlabel("Rotor speed (rpm)")
@@ -81,12 +80,12 @@ def main():
     plt.grid(True, which="both")
     plt.xticks(range(0, 10001, 2500))
     plt.yticks([0.00, 0.05, 0.10, 0.15])
-    plt.show()
+    show_figure(plt1, "results_static_thrust.png")
 
     # Plot RPM-CP
     plt2 = plt.figure(figsize=(6,4), dpi=100)
-    plt.plot([omega * 30 / 3.14159 for omega in Omega], CP0, label="qprop.c", linewidth=2)
-    plt.scatter([row[0] for row in uiuc_data], [row[2] for row in uiuc_data], label="UIUC WT", marker="D", s=20, color="darkorange")
+    plt.plot(Omega*RPM_PER_RAD, CP0, label="qprop.c", linewidth=2)
+    plt.scatter(rpm_uiuc, CP0_uiuc, label="UIUC WT", marker="D", s=20, color="darkorange")
     plt.title("APC 4.2x4 Power (Hovering)")
     plt.legend(loc="lower right")
     plt.xlabel("Rotor speed (rpm)")
@@ -99,7 +98,7 @@ def main():
     plt.xticks(range(0, 10001, 2500))
     #plt.yticks([0.05, 0.10, 0.15])
     plt.yticks([0.00, 0.05, 0.10, 0.15])
-    plt.show()
+    show_figure(plt2, "results_static_power.png")
 
 if __name__ == "__main__":
     main();
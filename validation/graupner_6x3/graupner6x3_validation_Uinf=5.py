@@ -15,10 +15,45 @@
 import ctypes;
 import math;
 import matplotlib.pyplot as plt;
+import numpy as np;
 import os;
 import sys;
 sys.path.insert(0, "./qprop/");
 import qprop;
+sys.path.insert(0, "../");
+from _headless import show_figure;      #see validation/_headless.py
+try:
+    from numba import njit;
+except ImportError:
+    #numba is optional: fall back to plain NumPy
+    def njit(*args, **kwargs):
+        return lambda f: f;
+
+#the jitted helpers below are compiled on the first run and cached in __pycache__,
+#next to this script, so the following runs skip the compilation
+#NOTE: set NUMBA_DISABLE_JIT=1 to run them as plain NumPy, e.g. for debugging
+
+#values at the element boundaries from the values at the element centers
+#inner boundaries are midpoints, the two outer ones are linearly extrapolated
+@njit(cache=True, fastmath=True, boundscheck=False)
+def element_boundaries(x):
+    xb = np.empty(x.shape[0] + 1)
+    xb[1:-1] = 0.5 * (x[1:] + x[:-1])
+    xb[0] = 1.5*x[0] - 0.5*x[1]
+    xb[-1] = 1.5*x[-1] - 0.5*x[-2]
+    return xb
+
+#thrust and torque distributions from the velocities and coefficients of the original QPROP output
+@njit(cache=True, fastmath=True, boundscheck=False)
+def compute_distributions(Wa, r, lam, Cl, Cd, c, D, rho):
+    Wt = Wa * r / (lam * (D/2))
+    W = np.hypot(Wa, Wt)
+    phi = np.arctan2(Wa, Wt)
+    Cn = Cl * np.cos(phi) - Cd * np.sin(phi)
+    Ct = Cl * np.sin(phi) + Cd * np.cos(phi)
+    dTdr = 0.5 * rho * W**2 * Cn * c
+    dQdr = 0.5 * rho * W**2 * Ct * c * r
+    return dTdr, dQdr
 
 def main():
     #define airfoil polars using the analytical model of the original QPROP
@@ -30,72 +65,57 @@ def main():
     )
 
     #read propeller geometry data from the original QPROP output
-    original_output = []
-    with open(os.path.join("original_qprop1.22_data_Uinf=5","cam6x3_qprop1.22_output.txt"), "r") as fileio:
-        lines = fileio.readlines()[24:]     #skip the first 24 lines
-        for line in lines:
-            original_output.append([float(x) for x in line.split()])
-    #the variable original_output is a List of List
-    #original_output[i][1]: radial distance of the element centers (m)
-    #original_output[i][2]: chord of each element (m)
-    #original_output[i][3]: sweep angle of each element (deg)
+    original_output = np.loadtxt(os.path.join("original_qprop1.22_data_Uinf=5","cam6x3_qprop1.22_output.txt"), skiprows=24)
+    #the variable original_output is a 2D array with one row per element
+    #original_output[:,0]: radial distance of the element centers (m)
+    #original_output[:,1]: chord of each element (m)
+    #original_output[:,2]: twist angle of each element (deg)
 
     #create propeller geometry
-    r = [row[0] for row in original_output]
-    c = [row[1] for row in original_output]
-    nelems = len(r)                     #number of elements
-    dr = [0.0] * nelems                 #width of each element (m)
-    dr[0] = r[1] - r[0]
-    dr[1:-1] = [0.5 * (r[i+1] - r[i-1]) for i in range(1, nelems-1)]
-    dr[-1] = r[-1] - r[-2]
+    r = original_output[:,0]
+    c = original_output[:,1]
+    dr = np.gradient(r)                 #width of each element (m), from central differences
     D = 2 * (r[-1] + 0.5 * dr[-1])      #propeller diameter (m) - should be 6inch=0.1524m
     B = 2                               #number of blades
-    elements = []
-    for i in range(nelems):
-        newelement = qprop.create_element(
-            c[i],
-            qprop.deg2rad(original_output[i][2]),
-            r[i],
-            dr[i],
-            airfoil_analytic
-        )
-        elements.append(newelement)
-    graupner6x3 = qprop.create_rotor(D, B, nelems, elements)
+    beta = np.deg2rad(original_output[:,2])
+    #qprop.c places the elements between consecutive sections: put the sections
+    #on the element boundaries, interpolating chord and twist from the centers
+    graupner6x3 = qprop.create_rotor_from_arrays(D, B, element_boundaries(c), element_boundaries(beta), element_boundaries(r), airfoil_analytic)
 
     #run qprop.c
     Uinf = 5.0;                         #freestream velocity (m/s)
     Omega = 14020*math.pi/30;           #rotor speed (rad/s)
     qpropc_results = qprop.qprop(graupner6x3, Uinf, Omega, 1e-6, 200)
-    for i in range(nelems):
-        if abs(qpropc_results.residuals[i]) > 1e-6:
-            print("ERROR while running qprop: convergence not reached in one or more elements")
-            break
+    if qprop.check_residuals(qpropc_results, 1e-6):
+        print("ERROR while running qprop: convergence not reached in one or more elements")
     print("qprop.c results:")
     print("  Thrust: ", round(qpropc_results.T, 5), " N")
     print("  Torque: ", round(qpropc_results.Q, 5), " N-m")
 
     #compare with original QPROP results
-    Wa_original = [row[9] for row in original_output]
-    Wt_original = [Wa * row[0] / (row[11] * (D/2))                  for Wa, row in zip(Wa_original, original_output)]
-    W_original = [math.sqrt(Wa**2 + Wt**2)                          for Wa, Wt in zip(Wa_original, Wt_original)]
-    phi_original = [math.atan(Wa/Wt)                                for Wa, Wt in zip(Wa_original, Wt_original)]
-    Cl_original = [row[3] for row in original_output]
-    Cd_original = [row[4] for row in original_output]
-    Cn_original = [Cl * math.cos(phi) - Cd * math.sin(phi)          for Cl, Cd, phi in zip(Cl_original, Cd_original, phi_original)]
-    Ct_original = [Cl * math.sin(phi) + Cd * math.cos(phi)          for Cl, Cd, phi in zip(Cl_original, Cd_original, phi_original)]
-    dTdr_original = [0.5 * 1.225 * W**2 * Cn * row[1]               for W, Cn, row in zip(W_original, Cn_original, original_output)]
-    dQdr_original = [0.5 * 1.225 * W**2 * Ct * row[1] * row[0]      for W, Ct, row in zip(W_original, Ct_original, original_output)]
+    dTdr_original, dQdr_original = compute_distributions(
+        original_output[:,9],           #Wa (m/s)
+        r,
+        original_output[:,11],          #adv_wake
+        original_output[:,3],           #Cl
+        original_output[:,4],           #Cd
+        c,
+        D,
+        1.225
+    )
+    elems = qpropc_results.as_arrays()  #zero-copy views of the qprop.c distributions
+    r_R = elems["r"] / (D/2)
 
     #compare thrust distributions
     plt1 = plt.figure(figsize=(6,4), dpi=100)       #600x400px
     plt.plot(
-        [qpropc_results.r[i] / (D/2)        for i in range(nelems)],
-        [qpropc_results.dTdr[i]             for i in range(nelems)],
+        r_R,
+        elems["dTdr"],
         label = "qprop.c",
         linewidth = 2
     )
     plt.scatter(
-        [r[i] / (D/2)                       for i in range(nelems)],
+        r / (D/2),
         dTdr_original,
         label = "QPROP v1.22",
         marker = "D",
@@ -108,18 +128,18 @@ def main():
     plt.grid(True, which="both", linestyle="--", alpha=0.7)
     plt.legend()
     plt.tight_layout()
-    plt.show()
+    show_figure(plt1, "results_Uinf=5_thrust.png")
 
     #compare torque distributions
     plt2 = plt.figure(figsize=(6,4), dpi=100)       #600x400px
     plt.plot(
-        [qpropc_results.r[i] / (D/2)        for i in range(nelems)],
-        [qpropc_results.dQdr[i]             for i in range(nelems)],
+        r_R,
+        elems["dQdr"],
         label = "qprop.c",
         linewidth = 2
     )
     plt.scatter(
-        [r[i] / (D/2)                       for i in range(nelems)],
+        r / (D/2),
         dQdr_original,
         label = "QPROP v1.22",
         marker = "D",
@@ -132,7 +152,11 @@ def main():
     plt.grid(True, which="both", linestyle="--", alpha=0.7)
     plt.legend()
     plt.tight_layout()
-    plt.show()
+    show_figure(plt2, "results_Uinf=5_torque.png")
+
+    #free the rotor allocated by the C library
+    #(the results are kept alive: the figures share memory with their NumPy views)
+    qprop.free_rotor(graupner6x3)
 
 if __name__ == "__main__":
     main()